@@ -26,7 +26,7 @@ from skimage.filters import unsharp_mask
 import deafrica_tools.app.widgetconstructors as deawidgets
 from deafrica_tools.coastal import get_coastlines
 from deafrica_tools.dask import create_local_dask_cluster
-from deafrica_tools.datahandling import load_ard
+from deafrica_tools.datahandling import find_datasets_cached, load_ard
 from deafrica_tools.plotting import xr_animation
 from deafrica_tools.spatial import reverse_geocode
 
@@ -115,7 +115,7 @@ def extract_data(self):
 
     # Find matching datasets
     dss = [
-        dc.find_datasets(product=i, **self.query_params)
+        find_datasets_cached(dc, product=i, **self.query_params)
         for i in sat_params[self.dealayer]["products"]
     ]
     dss = list(itertools.chain.from_iterable(dss))
@@ -143,6 +143,7 @@ def extract_data(self):
             min_gooddata=1.0 - (self.max_cloud_cover / 100),
             ls7_slc_off=False,
             mask_pixel_quality=self.cloud_mask,
+            cache=True,
             **self.load_params,
             **self.query_params,
         )
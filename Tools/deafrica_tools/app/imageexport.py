@@ -16,6 +16,7 @@ from skimage import exposure
 from traitlets import Unicode
 
 from deafrica_tools.dask import create_local_dask_cluster
+from deafrica_tools.datahandling import find_datasets_cached
 from deafrica_tools.spatial import reverse_geocode
 
 
@@ -277,7 +278,10 @@ def export_image_app(
     query_params = {"time": (str(start_date)), "geopolygon": geopolygon}
 
     # Find matching datasets
-    dss = [dc.find_datasets(product=i, **query_params) for i in sat_params[satellites]["products"]]
+    dss = [
+        find_datasets_cached(dc, product=i, **query_params)
+        for i in sat_params[satellites]["products"]
+    ]
     dss = list(itertools.chain.from_iterable(dss))
 
     # Get CRS and sensor
@@ -19,9 +19,9 @@ from ipyleaflet import (
     basemaps,
 )
 from localtileserver import TileClient, get_leaflet_tile_layer
-from odc.geo.xr import write_cog
 
 from deafrica_tools.bandindices import calculate_indices
+from deafrica_tools.datahandling import write_cog_streaming
 from deafrica_tools.waterbodies import get_waterbodies
 
 # Turn off all warnings.
@@ -83,6 +83,7 @@ def loadplanet(lon_range: tuple, lat_range: tuple, threshold_nvdi: float, thresh
         x=lon_range,
         resolution=(-10, 10),
         time=(f"{year:04d}"),
+        dask_chunks={"x": 2048, "y": 2048},
     )
     # Check if there was any current data in the previous load
     if len(ds) == 0:
@@ -94,6 +95,7 @@ def loadplanet(lon_range: tuple, lat_range: tuple, threshold_nvdi: float, thresh
             x=lon_range,
             resolution=(-10, 10),
             time=("2022", f"{year:04d}"),
+            dask_chunks={"x": 2048, "y": 2048},
         )
 
     # select the last best image
@@ -102,17 +104,21 @@ def loadplanet(lon_range: tuple, lat_range: tuple, threshold_nvdi: float, thresh
     # calculate NDVI and BUI
     ds = calculate_indices(ds, index=["NDVI", "BUI"], satellite_mission="s2")
 
+    # compute both indices in a single read of the bands, so the two
+    # exports below don't each re-load the GeoMAD
+    ds = ds[["NDVI", "BUI"]].persist()
+
     # Select NDVI value greater than threshold_nvdi value
     ds_ndvi = ds.where(ds.NDVI >= threshold_nvdi, np.nan).NDVI
 
-    # Save the ndvi raster file
-    write_cog(ds_ndvi, fname="ndvi.tif", overwrite=True)
+    # Save the ndvi raster file, streaming it to disk block by block
+    write_cog_streaming(ds_ndvi, fname="ndvi.tif")
 
     # Select BUI greater than 0
     ds_bui = ds.where(ds.BUI >= threshold_bui, np.nan).BUI
 
     # Save the bui raster file
-    write_cog(ds_bui, fname="bui.tif", overwrite=True)
+    write_cog_streaming(ds_bui, fname="bui.tif")
 
     # Defining the planet api
     planet_ = (
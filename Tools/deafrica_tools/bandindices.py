@@ -32,7 +32,9 @@ def calculate_indices(
     ds : xarray Dataset
         A two-dimensional or multi-dimensional array with containing the
         spectral bands required to calculate the index. These bands are
-        used as inputs to calculate the selected water index.
+        used as inputs to calculate the selected water index. Bands
+        loaded using ``load_ard(dtype="scaled_int16")`` are converted to
+        their physical values before the index is calculated.
 
     index : str or list of strs
         A string giving the name of the index to calculate or a list of
@@ -125,6 +127,8 @@ def calculate_indices(
         If drop = True, the new variable/s as DataArrays in the
         original Dataset.
     """
+    # Imported here as `datahandling` itself imports this module
+    from deafrica_tools.datahandling import scaled_int16_to_float
 
     # Set ds equal to a copy of itself in order to prevent the function
     # from editing the input dataset. This is to prevent unexpected
@@ -437,9 +441,13 @@ def calculate_indices(
 
         # Apply index function
         try:
-            # If normalised=True, divide data by 10,000 before applying func
+            # If normalised=True, divide data by 10,000 before applying func.
+            # Compact scaled integer bands (i.e. from `load_ard(dtype="scaled_int16")`)
+            # are converted to their physical values first
             mult = sr_max if normalise else 1.0
-            index_array = index_func(ds.rename(bands_to_rename) / mult)
+            index_array = index_func(
+                scaled_int16_to_float(ds.rename(bands_to_rename)) / mult
+            )
 
         except AttributeError:
             raise ValueError(
@@ -3,9 +3,12 @@ Machine learning functions for classification of remote sensing data contained
 in an Open Data Cube instance.
 """
 
+import hashlib
+import json
 import multiprocessing as mp
 import os
 import sys
+import tempfile
 import time
 import warnings
 from abc import ABCMeta, abstractmethod
@@ -22,6 +25,7 @@ import xarray as xr
 from dask_ml.wrappers import ParallelPostFit
 from datacube.utils import geometry
 from datacube.utils.geometry import assign_crs
+from shapely.geometry import box
 from sklearn.base import ClusterMixin
 from sklearn.cluster import AgglomerativeClustering, KMeans
 from sklearn.mixture import GaussianMixture
@@ -29,6 +33,7 @@ from sklearn.model_selection import BaseCrossValidator, KFold, ShuffleSplit
 from sklearn.utils import check_random_state
 from tqdm.auto import tqdm
 
+from deafrica_tools.datahandling import scaled_int16_to_float
 from deafrica_tools.spatial import xr_rasterize
 
 
@@ -200,6 +205,8 @@ def predict_xr(
     proba: bool = False,
     clean: bool = True,
     return_input: bool = False,
+    blockwise: bool = False,
+    full_proba: bool = False,
 ) -> xr.Dataset:
     """
     Using dask-ml ParallelPostfit(), runs  the parallel
@@ -207,7 +214,13 @@ def predict_xr(
     estimators. Useful for running predictions
     on a larger-than-RAM datasets.
 
-    Last modified: September 2020
+    If `blockwise=True`, the model is instead applied directly to
+    each native (y, x) dask block of `input_xr` using `map_blocks`.
+    Classes, probabilities and (optionally) the full per-class
+    probability cube are produced in a single pass over the input,
+    without building a flattened (pixels x features) copy of the data.
+
+    Last modified: October 2026
 
     Parameters
     ----------
@@ -232,6 +245,16 @@ def predict_xr(
     return_input : bool
         If True, then the data variables in the 'input_xr' dataset will
         be appended to the output xarray dataset.
+    blockwise : bool
+        If True, apply the model to each (y, x) dask block of `input_xr`
+        rather than to a flattened and rechunked copy of the data. All
+        outputs are computed from a single read of the input, so
+        `chunk_size` and `persist` are ignored. Defaults to False.
+    full_proba : bool
+        Only used if `blockwise=True` and `proba=True`. If True, the
+        output dataset will also contain a 'Class_probabilities'
+        variable holding the probability (%) of every class in
+        `model.classes_` along a new 'class' dimension.
 
     Returns
     ----------
@@ -242,6 +265,13 @@ def predict_xr(
         Has the same spatiotemporal structure as input_xr.
 
     """
+    # convert any compact scaled integer layers (e.g. from
+    # `load_ard(dtype="scaled_int16")`) back to their physical values
+    input_xr = scaled_int16_to_float(input_xr)
+
+    if blockwise is True:
+        return _predict_xr_blockwise(model, input_xr, proba, clean, return_input, full_proba)
+
     # if input_xr isn't dask, coerce it
     dask = True
     if not bool(input_xr.chunks):
@@ -357,6 +387,122 @@ def predict_xr(
     return output_xr
 
 
+def _predict_block(block, model, proba, clean, full_proba):
+    """
+    Apply a model to a single (variable, y, x) numpy block.
+
+    Returns a (layer, y, x) float32 array where the first layer holds
+    the index of the predicted class in `model.classes_`, the second
+    (if proba=True) the maximum class probability in %, and any further
+    layers (if full_proba=True) the probability of each class in %.
+    Class indices rather than labels are returned so that string or
+    integer labels survive the float32 output; models without
+    `classes_` (e.g. regressors) return their predictions directly.
+    """
+    n_vars, ny, nx = block.shape
+
+    # view the block as (pixels, features) for the model
+    features = block.reshape(n_vars, ny * nx).T
+
+    if clean is True:
+        features = np.where(np.isfinite(features), features, 0)
+
+    layers = []
+
+    if proba is True:
+        # derive classes from probabilities so the model is only run once
+        probs = model.predict_proba(features)
+        layers.append(np.argmax(probs, axis=1))
+        layers.append(probs.max(axis=1) * 100.0)
+        if full_proba is True:
+            layers.extend(probs.T * 100.0)
+    elif hasattr(model, "classes_"):
+        layers.append(np.searchsorted(model.classes_, model.predict(features)))
+    else:
+        layers.append(model.predict(features))
+
+    out = np.stack(layers).astype(np.float32).reshape(len(layers), ny, nx)
+
+    if clean is True:
+        out = np.where(np.isfinite(out), out, 0)
+
+    return out
+
+
+def _predict_xr_blockwise(model, input_xr, proba, clean, return_input, full_proba):
+    """
+    Blockwise prediction engine used by `predict_xr` when
+    `blockwise=True`. See that function for a description of the
+    parameters.
+    """
+    if isinstance(input_xr, xr.DataArray):
+        input_xr = input_xr.to_dataset(name=input_xr.name or "band")
+
+    # if input_xr isn't dask, coerce it
+    dask = True
+    if not bool(input_xr.chunks):
+        dask = False
+        input_xr = input_xr.chunk({"x": len(input_xr.x), "y": len(input_xr.y)})
+
+    x, y, crs = input_xr.x, input_xr.y, input_xr.geobox.crs
+
+    # stack variables along a single-chunk leading axis; the (y, x)
+    # chunks of the input are left untouched
+    arr = input_xr.to_array().transpose("variable", "y", "x").data
+    arr = arr.rechunk({0: -1})
+
+    n_layers = 1
+    if proba is True:
+        n_layers = 2
+        if full_proba is True:
+            n_layers += len(model.classes_)
+
+    print("predicting...")
+    out = da.map_blocks(
+        _predict_block,
+        arr,
+        model=model,
+        proba=proba,
+        clean=clean,
+        full_proba=full_proba,
+        chunks=((n_layers,), *arr.chunks[1:]),
+        dtype=np.float32,
+    )
+
+    # all outputs are slices of the same graph, so the input is read once
+    predictions = out[0]
+    if hasattr(model, "classes_"):
+        # map class indices back to labels, keeping the labels' dtype
+        predictions = predictions.map_blocks(
+            lambda index, classes: classes[index.astype(np.intp)],
+            classes=model.classes_,
+            dtype=model.classes_.dtype,
+        )
+
+    output_xr = xr.DataArray(predictions, coords={"x": x, "y": y}, dims=["y", "x"])
+    output_xr = output_xr.to_dataset(name="Predictions")
+
+    if proba is True:
+        output_xr["Probabilities"] = xr.DataArray(out[1], coords={"x": x, "y": y}, dims=["y", "x"])
+
+        if full_proba is True:
+            output_xr["Class_probabilities"] = xr.DataArray(
+                out[2:],
+                coords={"class": model.classes_, "x": x, "y": y},
+                dims=["class", "y", "x"],
+            )
+
+    if return_input is True:
+        output_xr = xr.merge([output_xr, input_xr], compat="override")
+
+    output_xr = assign_crs(output_xr, str(crs))
+
+    if dask is False:
+        output_xr = output_xr.compute()
+
+    return output_xr
+
+
 class HiddenPrints:
     """
     For concealing unwanted print statements called by other functions
@@ -426,6 +572,22 @@ def _get_training_data_for_shp(
 
     # create polygon mask
     mask = xr_rasterize(gdf.iloc[[index]], data)
+
+    _extract_training_data(
+        data, mask, row, out_arrs, out_vars, return_coords, field, zonal_stats
+    )
+
+
+def _extract_training_data(
+    data, mask, row, out_arrs, out_vars, return_coords, field, zonal_stats
+):
+    """
+    Extract the training data for a single geometry from the output of
+    `feature_func`, given a mask of the geometry's pixels. Shared by
+    `_get_training_data_for_shp` and `_get_training_data_for_group`.
+    The extracted data is appended to `out_arrs` and the data variable
+    names to `out_vars`.
+    """
     data = data.where(mask)
 
     # Check that feature_func has removed time
@@ -448,7 +610,7 @@ def _get_training_data_for_shp(
     band = [m for m in data.data_vars][0]
     _id = xr.zeros_like(data[band])
     data["id"] = _id
-    data["id"] = data["id"] + gdf.iloc[index]["id"]
+    data["id"] = data["id"] + row["id"]
 
     # If no zonal stats were requested then extract all pixel values
     if zonal_stats is None:
@@ -473,14 +635,256 @@ def _get_training_data_for_shp(
     out_vars.append([field] + list(data.data_vars))
 
 
+def _get_training_data_for_group(
+    gdf,
+    indices,
+    out_arrs,
+    out_vars,
+    dc_query,
+    return_coords,
+    feature_func=None,
+    field=None,
+    zonal_stats=None,
+):
+    """
+    Batched equivalent of `_get_training_data_for_shp`. Runs `feature_func`
+    once over the bounding box of all the polygons at positions `indices`
+    of `gdf`, then extracts every polygon's pixels from that single array
+    using a raster of polygon ids. Parameters are inherited from
+    `collect_training_data` and `_get_training_data_for_shp`.
+
+    Where polygons in the group overlap, shared pixels are only
+    assigned to the polygon rasterized last.
+
+    """
+
+    # prevent function altering dictionary kwargs
+    dc_query = deepcopy(dc_query)
+
+    # remove dask chunks if supplied as using
+    # mulitprocessing for parallization
+    if "dask_chunks" in dc_query.keys():
+        dc_query.pop("dask_chunks", None)
+
+    # set up query based on the bounding box of the group
+    gdf_group = gdf.iloc[list(indices)]
+    geom = geometry.Geometry(geom=box(*gdf_group.total_bounds), crs=gdf.crs)
+    dc_query.update({"geopolygon": geom})
+
+    # Use input feature function
+    data = feature_func(dc_query)
+
+    # rasterize all polygons in the group at once, offsetting ids
+    # by one so that 0 can be used for pixels outside every polygon
+    id_raster = xr_rasterize(
+        gdf_group.assign(raster_id=gdf_group["id"] + 1),
+        data,
+        attribute_col="raster_id",
+        dtype="int32",
+        verbose=False,
+    )
+    id_values = id_raster.values
+
+    for index in indices:
+        row = gdf.iloc[index]
+        mask = id_raster == (row["id"] + 1)
+
+        # crop to the polygon's pixels so extraction doesn't scale
+        # with the size of the whole group
+        rows, cols = np.nonzero(id_values == (row["id"] + 1))
+        if len(rows) > 0:
+            crop = {
+                "y": slice(rows.min(), rows.max() + 1),
+                "x": slice(cols.min(), cols.max() + 1),
+            }
+            _extract_training_data(
+                data.isel(crop),
+                mask.isel(crop),
+                row,
+                out_arrs,
+                out_vars,
+                return_coords,
+                field,
+                zonal_stats,
+            )
+        else:
+            _extract_training_data(
+                data, mask, row, out_arrs, out_vars, return_coords, field, zonal_stats
+            )
+
+
+def _group_polygons(gdf, group_size):
+    """
+    Group the polygons in `gdf` by the cell of a regular grid with
+    spacing `group_size` (in the units of the gdf's CRS) that their
+    centroid falls in.
+
+    Returns
+    --------
+    A list of lists of positional indices into `gdf`.
+    """
+    centroids = gdf.geometry.centroid
+    cells = pd.DataFrame(
+        {
+            "x": np.floor(centroids.x.values / group_size),
+            "y": np.floor(centroids.y.values / group_size),
+        }
+    )
+    return [list(group) for group in cells.groupby(["x", "y"]).indices.values()]
+
+
+# Per-process state for the training data worker pool. Populated once per
+# worker by `_init_training_data_worker` so that tasks only carry indices.
+_training_data_worker_state = {}
+
+
+def _init_training_data_worker(
+    gdf, dc_query, return_coords, feature_func, field, zonal_stats, out_dir
+):
+    """
+    Initializer for the `_get_training_data_parallel` worker pool.
+    Stores the arguments shared by every task in the worker process so
+    that the GeoDataFrame is sent to each worker once rather than once
+    per polygon.
+    """
+    _training_data_worker_state.update(
+        gdf=gdf,
+        dc_query=dc_query,
+        return_coords=return_coords,
+        feature_func=feature_func,
+        field=field,
+        zonal_stats=zonal_stats,
+        out_dir=out_dir,
+    )
+
+
+def _get_training_data_for_indices(indices):
+    """
+    Worker task for `_get_training_data_parallel`. Extracts the training
+    data for the polygons at positions `indices` of the worker's
+    GeoDataFrame and writes each polygon's array to an .npy file in the
+    output directory. If more than one index is supplied, the polygons
+    are loaded together using `_get_training_data_for_group`.
+
+    Returns
+    --------
+    A list of tuples of polygon id and data variable names. The names
+    are None for polygons where the extraction failed.
+    """
+    state = _training_data_worker_state
+    gdf = state["gdf"]
+
+    results = []
+    column_names = []
+
+    try:
+        if len(indices) == 1:
+            _get_training_data_for_shp(
+                gdf,
+                indices[0],
+                gdf.iloc[indices[0]],
+                results,
+                column_names,
+                state["dc_query"],
+                state["return_coords"],
+                state["feature_func"],
+                state["field"],
+                state["zonal_stats"],
+            )
+        else:
+            _get_training_data_for_group(
+                gdf,
+                indices,
+                results,
+                column_names,
+                state["dc_query"],
+                state["return_coords"],
+                state["feature_func"],
+                state["field"],
+                state["zonal_stats"],
+            )
+    except Exception as e:
+        ids = gdf["id"].iloc[indices].tolist()
+        print(f"Failed to collect training data for polygon ids {ids}: {e}")
+        return [(_id, None) for _id in ids]
+
+    completed = []
+    for index, result, names in zip(indices, results, column_names):
+        _id = gdf["id"].iloc[index]
+
+        # write to a temporary name first so a crash never leaves a
+        # partially written file behind under the final name
+        out_file = os.path.join(state["out_dir"], f"{_id}.npy")
+        tmp_file = out_file + ".tmp.npy"
+        np.save(tmp_file, result)
+        os.replace(tmp_file, out_file)
+
+        completed.append((_id, names))
+
+    return completed
+
+
+def _training_data_fingerprints(gdf, dc_query, return_coords, feature_func, field, zonal_stats):
+    """
+    Return a fingerprint for each polygon in `gdf`, hashing its geometry
+    and `field` value together with the query and feature settings, so
+    that checkpointed results are only reused for the same polygon
+    collected in the same way.
+    """
+    code = getattr(feature_func, "__code__", None)
+    settings = hashlib.sha1(
+        repr(
+            (
+                sorted((str(k), repr(v)) for k, v in dc_query.items()),
+                return_coords,
+                getattr(feature_func, "__module__", None),
+                getattr(feature_func, "__qualname__", repr(feature_func)),
+                code.co_code if code is not None else None,
+                field,
+                zonal_stats,
+            )
+        ).encode()
+    ).digest()
+
+    values = gdf[field] if field is not None else [None] * len(gdf)
+    fingerprints = []
+    for geom, value in zip(gdf.geometry, values):
+        h = hashlib.sha1(settings)
+        h.update(geom.wkb)
+        h.update(repr(value).encode())
+        fingerprints.append(h.hexdigest())
+    return fingerprints
+
+
 def _get_training_data_parallel(
-    gdf, dc_query, ncpus, return_coords, feature_func=None, field=None, zonal_stats=None
+    gdf,
+    dc_query,
+    ncpus,
+    return_coords,
+    feature_func=None,
+    field=None,
+    zonal_stats=None,
+    checkpoint_dir=None,
+    resume=True,
+    group_size=None,
 ):
     """
     Function passing the '_get_training_data_for_shp' function
     to a mulitprocessing.Pool.
     Inherits variables from 'collect_training_data'.
 
+    The GeoDataFrame and query are sent to each worker once, and tasks
+    only carry the positions of polygons in `gdf`. Workers stream their
+    results to one .npy file per polygon in `checkpoint_dir`, and the id
+    of every completed polygon is appended to a checkpoint file along
+    with a fingerprint of its geometry, field value and the collection
+    settings. If `resume` is True, polygons listed in the checkpoint
+    with a matching fingerprint are not collected again; all others
+    (including ids reused by a different `gdf` or query) are recollected
+    and overwritten.
+    If `checkpoint_dir` is None, a temporary directory is used and
+    removed once the results have been read.
+
     """
     # Check if dask-client is running
     try:
@@ -495,41 +899,92 @@ def _get_training_data_parallel(
             "this function from multiprocessing. Close the client."
         )
 
-    # instantiate lists that can be shared across processes
-    manager = mp.Manager()
-    results = manager.list()
-    column_names = manager.list()
+    tmp_dir = None
+    if checkpoint_dir is None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        checkpoint_dir = tmp_dir.name
+    else:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    checkpoint_file = os.path.join(checkpoint_dir, "completed_ids.txt")
+    columns_file = os.path.join(checkpoint_dir, "column_names.json")
+
+    fingerprints = _training_data_fingerprints(
+        gdf, dc_query, return_coords, feature_func, field, zonal_stats
+    )
+    fingerprint_by_id = dict(zip(gdf["id"].tolist(), fingerprints))
+
+    # read ids and fingerprints of polygons completed by a previous run;
+    # ids are positional, so only trust those whose fingerprint matches
+    completed = {}
+    if resume and os.path.exists(checkpoint_file):
+        with open(checkpoint_file) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    completed[int(parts[0])] = parts[1]
+
+    done = np.array(
+        [completed.get(_id) == fp for _id, fp in zip(gdf["id"], fingerprints)], dtype=bool
+    )
+
+    column_names = []
+    if done.any() and os.path.exists(columns_file):
+        with open(columns_file) as f:
+            column_names = json.load(f)
+
+    todo = np.flatnonzero(~done).tolist()
+    if len(todo) < len(gdf):
+        print(f"Resuming from checkpoint: {len(gdf) - len(todo)} polygons already collected")
+
+    # remove stale arrays for the polygons about to be (re)collected, so
+    # a polygon that fails this time is not read back from an earlier run
+    for _id in gdf["id"].iloc[todo]:
+        out_file = os.path.join(checkpoint_dir, f"{_id}.npy")
+        if os.path.exists(out_file):
+            os.remove(out_file)
+
+    # split remaining polygons into tasks, grouping neighbours if requested
+    if group_size is None:
+        tasks = [[index] for index in todo]
+    else:
+        tasks = [[todo[i] for i in group] for group in _group_polygons(gdf.iloc[todo], group_size)]
 
     # progress bar
-    pbar = tqdm(total=len(gdf))
+    pbar = tqdm(total=len(todo))
 
-    def update(*a):
-        pbar.update()
+    initargs = (gdf, dc_query, return_coords, feature_func, field, zonal_stats, checkpoint_dir)
 
-    with mp.Pool(ncpus) as pool:
-        for index, row in gdf.iterrows():
-            pool.apply_async(
-                _get_training_data_for_shp,
-                [
-                    gdf,
-                    index,
-                    row,
-                    results,
-                    column_names,
-                    dc_query,
-                    return_coords,
-                    feature_func,
-                    field,
-                    zonal_stats,
-                ],
-                callback=update,
-            )
+    with mp.Pool(ncpus, initializer=_init_training_data_worker, initargs=initargs) as pool:
+        with open(checkpoint_file, "a") as checkpoint:
+            for result in pool.imap_unordered(_get_training_data_for_indices, tasks):
+                pbar.update(len(result))
+
+                for _id, names in result:
+                    if names is None:
+                        continue
+
+                    if not column_names:
+                        column_names = names
+                        with open(columns_file, "w") as f:
+                            json.dump(column_names, f)
+
+                    checkpoint.write(f"{_id} {fingerprint_by_id[_id]}\n")
+                checkpoint.flush()
 
-        pool.close()
-        pool.join()
         pbar.close()
 
-    return column_names, results
+    # read back the arrays for the polygons in this gdf
+    results = []
+    for _id in gdf["id"]:
+        out_file = os.path.join(checkpoint_dir, f"{_id}.npy")
+        if os.path.exists(out_file):
+            results.append(np.load(out_file, mmap_mode=None if tmp_dir else "r"))
+
+    if tmp_dir is not None:
+        tmp_dir.cleanup()
+
+    return [column_names], results
 
 
 def collect_training_data(
@@ -544,6 +999,8 @@ def collect_training_data(
     fail_threshold: float = 0.02,
     fail_ratio: float = 0.5,
     max_retries: float = 3,
+    checkpoint_dir: str = None,
+    group_size: float = None,
 ) -> tuple[list[str], np.ndarray]:
     """
     This function provides methods for gathering training data from the ODC over
@@ -607,6 +1064,26 @@ def collect_training_data(
     max_retries: int, default 3
         Maximum number of times to retry collecting samples. This number is invoked
         if the 'fail_threshold' is not reached.
+    checkpoint_dir: str, optional
+        Only used if ncpus > 1. A directory into which the training data
+        for each polygon is streamed as it is collected, along with a
+        checkpoint of the completed polygon ids. If the function is
+        re-run with the same `checkpoint_dir` (e.g. after a crash),
+        polygons that were already collected with the same geometry,
+        `field` value, query and feature settings are skipped; any
+        others are collected again.
+        If None (default), a temporary directory is used.
+    group_size: float, optional
+        If supplied, neighbouring polygons are collected together to avoid
+        repeatedly reading the same imagery. Polygons are grouped by the
+        cell of a regular grid with this spacing (in the units of the
+        gdf's CRS, e.g. 0.5 for EPSG:4326) that their centroid falls in.
+        The 'feature_func' is run once over the bounding box of each group
+        and every polygon's pixels are then extracted from that single
+        array, so the spacing should be chosen so that a group's bounding
+        box fits in memory. Pixels shared by overlapping polygons in the
+        same group are only assigned to one of them. Defaults to None
+        (one load per polygon).
 
     Returns
     --------
@@ -643,23 +1120,43 @@ def collect_training_data(
         results = []
         column_names = []
 
-        # loop through polys and extract training data
-        for index, row in gdf.iterrows():
-            print(" Feature {:04}/{:04}\r".format(i + 1, len(gdf)), end="")
+        if group_size is None:
+            # loop through polys and extract training data
+            for index, row in gdf.iterrows():
+                print(" Feature {:04}/{:04}\r".format(i + 1, len(gdf)), end="")
 
-            _get_training_data_for_shp(
-                gdf,
-                index,
-                row,
-                results,
-                column_names,
-                dc_query,
-                return_coords,
-                feature_func,
-                field,
-                zonal_stats,
-            )
-            i += 1
+                _get_training_data_for_shp(
+                    gdf,
+                    index,
+                    row,
+                    results,
+                    column_names,
+                    dc_query,
+                    return_coords,
+                    feature_func,
+                    field,
+                    zonal_stats,
+                )
+                i += 1
+
+        else:
+            # loop through groups of neighbouring polys, loading each once
+            groups = _group_polygons(gdf, group_size)
+            for indices in groups:
+                print(" Group {:04}/{:04}\r".format(i + 1, len(groups)), end="")
+
+                _get_training_data_for_group(
+                    gdf,
+                    indices,
+                    results,
+                    column_names,
+                    dc_query,
+                    return_coords,
+                    feature_func,
+                    field,
+                    zonal_stats,
+                )
+                i += 1
 
     else:
         print("Collecting training data in parallel mode")
@@ -671,6 +1168,8 @@ def collect_training_data(
             feature_func=feature_func,
             field=field,
             zonal_stats=zonal_stats,
+            checkpoint_dir=checkpoint_dir,
+            group_size=group_size,
         )
 
     # column names are appended during each iteration
@@ -729,6 +1228,9 @@ def collect_training_data(
                     feature_func=feature_func,
                     field=field,
                     zonal_stats=zonal_stats,
+                    checkpoint_dir=checkpoint_dir,
+                    resume=False,
+                    group_size=group_size,
                 )
 
                 # Stack the extracted training data for each feature into a single array
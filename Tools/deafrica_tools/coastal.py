@@ -2,9 +2,18 @@
 Coastal analyses on Digital Earth Africa data.
 """
 
+import glob
 import os
+import tempfile
+import uuid
+import warnings
+import zipfile
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
+import dask
+import dask.array as da
 import geopandas as gpd
 import matplotlib.pyplot as plt
 import numpy as np
@@ -32,6 +41,292 @@ register_matplotlib_converters()
 # URL for the DE Africa Coastlines data on Geoserver.
 WFS_ADDRESS = "https://geoserver.digitalearth.africa/geoserver/wfs"
 
+# Maximum number of points held in the in-memory tide constituent
+# cache used by `model_tides(cache=True)`, and the number of decimal
+# places coordinates are rounded to when used as cache keys (5 decimal
+# places is roughly 1 m at the equator)
+TIDE_CACHE_SIZE = 1_000_000
+TIDE_CACHE_DECIMALS = 5
+
+# Number of shard files an on-disk tide constituent cache can grow to
+# before they are merged into one
+TIDE_CACHE_MAX_SHARDS = 32
+
+# In-memory tide constituent cache. Keys are a model configuration tuple
+# followed by the rounded lon/lat of a point; values are tuples of the
+# point's constituent amplitudes, phases and mask
+_tide_constituent_cache = OrderedDict()
+
+# Constituent names for each model configuration in the cache, and the
+# configurations already read from an on-disk cache
+_tide_constituent_names = {}
+_tide_cache_loaded = set()
+
+
+def clear_tide_cache():
+    """
+    Remove all tide constituents from the in-memory cache used by
+    `model_tides(cache=True)`. On-disk caches are not affected.
+    """
+    _tide_constituent_cache.clear()
+    _tide_constituent_names.clear()
+    _tide_cache_loaded.clear()
+    _tide_model.cache_clear()
+
+
+@lru_cache(maxsize=16)
+def _tide_model(directory, model):
+    """
+    Return the `pyTMD` model parameters for a tide model, caching
+    them so they are only parsed once per directory and model.
+    """
+    return pyTMD.io.model(directory, format="netcdf", compressed=False).elevation(model)
+
+
+def _extract_tide_constituents(model, lon, lat, crop, method, extrapolate, cutoff):
+    """
+    Read tidal constants from a tide model's files and interpolate them
+    to the supplied lon/lat points.
+
+    Returns
+    -------
+    amp, ph : numpy.ma.MaskedArray
+        Constituent amplitudes and phases with shape (points, constituents).
+    c : list
+        The names of the constituents.
+    """
+    if model.format in ("OTIS", "ATLAS-compact", "TMD3"):
+        if model.format.startswith("ATLAS"):
+            grid = "ATLAS"
+        else:
+            grid = model.format
+        amp, ph, D, c = pyTMD.io.OTIS.extract_constants(
+            lon,
+            lat,
+            model.grid_file,
+            model.model_file,
+            model.projection,
+            type=model.type,
+            crop=crop,
+            method=method,
+            extrapolate=extrapolate,
+            cutoff=cutoff,
+            grid=grid,
+        )
+
+    elif model.format == "ATLAS-netcdf":
+        amp, ph, D, c = pyTMD.io.ATLAS.extract_constants(
+            lon,
+            lat,
+            model.grid_file,
+            model.model_file,
+            type=model.type,
+            crop=crop,
+            method=method,
+            extrapolate=extrapolate,
+            cutoff=cutoff,
+            scale=model.scale,
+            compressed=model.compressed,
+        )
+
+    elif model.format in ("GOT-ascii", "GOT-netcdf"):
+        amp, ph, c = pyTMD.io.GOT.extract_constants(
+            lon,
+            lat,
+            model.model_file,
+            method=method,
+            crop=crop,
+            extrapolate=extrapolate,
+            cutoff=cutoff,
+            scale=model.scale,
+            compressed=model.compressed,
+        )
+
+    elif model.format in ("FES-netcdf", "FES-ascii"):
+        amp, ph = pyTMD.io.FES.extract_constants(
+            lon,
+            lat,
+            model.model_file,
+            type=model.type,
+            crop=crop,
+            version=model.version,
+            method=method,
+            extrapolate=extrapolate,
+            cutoff=cutoff,
+            scale=model.scale,
+            compressed=model.compressed,
+        )
+
+        # Available model constituents
+        c = model.constituents
+
+    return amp, ph, c
+
+
+def _tide_cache_dir(cache_dir, config):
+    """
+    Directory of the on-disk cache shards for a model configuration.
+    """
+    model_name, _, method, extrapolate, cutoff = config
+    return os.path.join(
+        cache_dir, f"{model_name}_{method}_{extrapolate}_{cutoff}".replace(" ", "")
+    )
+
+
+def _read_tide_cache_shards(shard_dir):
+    """
+    Read the .npz cache shards in `shard_dir`, oldest first. Returns a
+    list of (path, lon, lat, amp, ph, mask, c) tuples, skipping shards
+    that have been removed or cannot be read.
+    """
+    paths = []
+    for path in glob.glob(os.path.join(shard_dir, "*.npz")):
+        try:
+            paths.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            pass
+
+    shards = []
+    for _, path in sorted(paths):
+        try:
+            with np.load(path) as cached:
+                shards.append(
+                    (path, *(cached[k] for k in ("lon", "lat", "amp", "ph", "mask", "c")))
+                )
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            warnings.warn(f"Skipping unreadable tide cache file {path}: {e}")
+    return shards
+
+
+def _write_tide_cache_shard(shard_dir, lon, lat, amp, ph, mask, c):
+    """
+    Atomically write a cache shard to `shard_dir`, writing to a
+    temporary file first so an interrupted write cannot leave a
+    partial shard behind.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=shard_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, lon=lon, lat=lat, amp=amp, ph=ph, mask=mask, c=np.array(c))
+        os.replace(tmp_path, os.path.join(shard_dir, f"{uuid.uuid4().hex}.npz"))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _compact_tide_cache(shard_dir):
+    """
+    Merge the cache shards in `shard_dir` into a single shard, keeping
+    the most recently written `TIDE_CACHE_SIZE` unique points.
+    """
+    shards = _read_tide_cache_shards(shard_dir)
+    if len(shards) < 2:
+        return
+
+    lon, lat, amp, ph, mask = (np.concatenate([s[i] for s in shards]) for i in range(1, 6))
+
+    # keep the last occurrence of each point, then the newest points
+    _, first_rev = np.unique(np.stack([lon, lat])[:, ::-1], axis=1, return_index=True)
+    keep = np.sort(len(lon) - 1 - first_rev)[-TIDE_CACHE_SIZE:]
+
+    _write_tide_cache_shard(
+        shard_dir, lon[keep], lat[keep], amp[keep], ph[keep], mask[keep], shards[-1][6]
+    )
+    for shard in shards:
+        try:
+            os.remove(shard[0])
+        except FileNotFoundError:
+            pass
+
+
+def _cached_tide_constituents(model, config, lon, lat, crop, cache_dir=None):
+    """
+    Return tide constituents for lon/lat points, only extracting them
+    from the tide model files for points that are not already in the
+    in-memory (or optionally on-disk) tide constituent cache.
+    See `_extract_tide_constituents` for the returned values.
+
+    On disk, each call that extracts new points writes them as a new
+    shard file, rather than rewriting the whole cache; shards are
+    merged once there are more than `TIDE_CACHE_MAX_SHARDS`.
+    """
+    _, _, method, extrapolate, cutoff = config
+    shard_dir = None if cache_dir is None else _tide_cache_dir(cache_dir, config)
+
+    # Populate the in-memory cache from disk the first time a
+    # configuration is requested
+    if (shard_dir is not None) and (config not in _tide_cache_loaded):
+        _tide_cache_loaded.add(config)
+        for _, s_lon, s_lat, s_amp, s_ph, s_mask, s_c in _read_tide_cache_shards(shard_dir):
+            _tide_constituent_names[config] = list(s_c)
+            # copy rows so evicted points don't keep the whole shard alive
+            for i, (lon_i, lat_i) in enumerate(zip(s_lon.tolist(), s_lat.tolist())):
+                key = (*config, lon_i, lat_i)
+                _tide_constituent_cache[key] = (
+                    s_amp[i].copy(),
+                    s_ph[i].copy(),
+                    s_mask[i].copy(),
+                )
+                _tide_constituent_cache.move_to_end(key)
+        while len(_tide_constituent_cache) > TIDE_CACHE_SIZE:
+            _tide_constituent_cache.popitem(last=False)
+
+    # Round coordinates so nearby requests share cache entries
+    lon = np.round(np.asarray(lon, dtype=np.float64), TIDE_CACHE_DECIMALS)
+    lat = np.round(np.asarray(lat, dtype=np.float64), TIDE_CACHE_DECIMALS)
+    keys = [(*config, lon_i, lat_i) for lon_i, lat_i in zip(lon.tolist(), lat.tolist())]
+
+    # Extract constituents for unique points missing from the cache
+    missing = list(dict.fromkeys(key for key in keys if key not in _tide_constituent_cache))
+    new_entries = {}
+    if missing:
+        missing_lon = np.array([key[-2] for key in missing])
+        missing_lat = np.array([key[-1] for key in missing])
+        amp, ph, c = _extract_tide_constituents(
+            model, missing_lon, missing_lat, crop, method, extrapolate, cutoff
+        )
+        _tide_constituent_names[config] = c
+        amp_data = np.ma.getdata(amp)
+        ph_data = np.ma.getdata(ph)
+        mask = np.ma.getmaskarray(amp) | np.ma.getmaskarray(ph)
+        for i, key in enumerate(missing):
+            new_entries[key] = (amp_data[i].copy(), ph_data[i].copy(), mask[i].copy())
+
+    # Assemble outputs from the cache and newly extracted points
+    values = []
+    for key in keys:
+        if key in new_entries:
+            values.append(new_entries[key])
+        else:
+            values.append(_tide_constituent_cache[key])
+            _tide_constituent_cache.move_to_end(key)
+
+    amp = np.ma.array([v[0] for v in values], mask=[v[2] for v in values])
+    ph = np.ma.array([v[1] for v in values], mask=[v[2] for v in values])
+
+    # Add new points to the cache, evicting the least recently used
+    _tide_constituent_cache.update(new_entries)
+    while len(_tide_constituent_cache) > TIDE_CACHE_SIZE:
+        _tide_constituent_cache.popitem(last=False)
+
+    # Write only the new points to disk, as a new shard
+    if (shard_dir is not None) and new_entries:
+        new_values = list(new_entries.values())
+        _write_tide_cache_shard(
+            shard_dir,
+            np.array([key[-2] for key in new_entries]),
+            np.array([key[-1] for key in new_entries]),
+            np.stack([v[0] for v in new_values]),
+            np.stack([v[1] for v in new_values]),
+            np.stack([v[2] for v in new_values]),
+            _tide_constituent_names[config],
+        )
+        if len(glob.glob(os.path.join(shard_dir, "*.npz"))) > TIDE_CACHE_MAX_SHARDS:
+            _compact_tide_cache(shard_dir)
+
+    return amp, ph, _tide_constituent_names[config]
+
 
 def model_tides(
     x: float | list[float],
@@ -44,6 +339,10 @@ def model_tides(
     method: str = "bilinear",
     extrapolate: bool = True,
     cutoff: int | float = 10.0,
+    cache: bool = False,
+    cache_dir: str = None,
+    output_format: str = "long",
+    time_block_size: int = 1000,
 ):
     """
     Compute tides at points and times using tidal harmonics.
@@ -122,12 +421,40 @@ def model_tides(
     cutoff : int or float
         Extrapolation cutoff in kilometers. Set to `np.inf`
         to extrapolate for all points.
+    cache : bool
+        Whether to cache the tidal constituents interpolated for
+        each point, so that repeated calls for the same locations
+        (e.g. from `pixel_tides` or `tidal_tag`) skip reading the
+        tide model files. Coordinates are rounded to
+        `TIDE_CACHE_DECIMALS` decimal places of longitude/latitude
+        to match points against the cache, and at most
+        `TIDE_CACHE_SIZE` points are kept in memory. Use
+        `clear_tide_cache()` to empty the cache. Defaults to False.
+    cache_dir : string, optional
+        If `cache=True`, an optional directory in which the cache is
+        also stored as .npz files (in one sub-directory per tide model
+        configuration), allowing it to persist between sessions.
+    output_format : string
+        Whether to return a long-format pandas.DataFrame ("long", the
+        default) or a dense numpy array of tide heights with shape
+        (time, point) ("array"). The "array" option avoids creating
+        time and coordinate columns for every combination of time and
+        point, which is useful when modelling tides for many points.
+    time_block_size : int
+        Tides are predicted for all points at once in blocks of this
+        many times, limiting peak memory use for long time series.
+        Defaults to 1000.
 
     Returns
     -------
     A pandas.DataFrame containing tide heights for every
-    combination of time and point coordinates.
+    combination of time and point coordinates, or if
+    `output_format="array"`, a numpy.ndarray of tide heights with
+    shape (time, point).
     """
+    if output_format not in ("long", "array"):
+        raise ValueError("`output_format` must be either 'long' or 'array'")
+
     # Check that tide directory is accessible
     try:
         os.access(directory, os.F_OK)
@@ -135,7 +462,8 @@ def model_tides(
         raise FileNotFoundError("Invalid tide directory")
 
     # Get parameters for tide model
-    model = pyTMD.io.model(directory, format="netcdf", compressed=False).elevation(model)
+    model_name = model
+    model = _tide_model(directory, model_name)
 
     # If time passed as a single Timestamp, convert to datetime64
     if isinstance(time, pd.Timestamp):
@@ -170,77 +498,19 @@ def model_tides(
     # Delta time (TT - UT1) file
     delta_file = timescale.utilities.get_data_path(["data", "merged_deltat.data"])
 
-    # Read tidal constants and interpolate to grid points
-    if model.format in ("OTIS", "ATLAS-compact", "TMD3"):
-        if model.format.startswith("ATLAS"):
-            grid = "ATLAS"
-        else:
-            grid = model.format
-        amp, ph, D, c = pyTMD.io.OTIS.extract_constants(
-            lon,
-            lat,
-            model.grid_file,
-            model.model_file,
-            model.projection,
-            type=model.type,
-            crop=crop,
-            method=method,
-            extrapolate=extrapolate,
-            cutoff=cutoff,
-            grid=grid,
+    # Read tidal constants and interpolate to grid points, optionally
+    # re-using constants previously interpolated for the same points
+    if cache:
+        config = (model_name, directory, method, extrapolate, cutoff)
+        amp, ph, c = _cached_tide_constituents(model, config, lon, lat, crop, cache_dir)
+    else:
+        amp, ph, c = _extract_tide_constituents(
+            model, lon, lat, crop, method, extrapolate, cutoff
         )
-        deltat = np.zeros_like(t)
 
-    elif model.format == "ATLAS-netcdf":
-        amp, ph, D, c = pyTMD.io.ATLAS.extract_constants(
-            lon,
-            lat,
-            model.grid_file,
-            model.model_file,
-            type=model.type,
-            crop=crop,
-            method=method,
-            extrapolate=extrapolate,
-            cutoff=cutoff,
-            scale=model.scale,
-            compressed=model.compressed,
-        )
+    if model.format in ("OTIS", "ATLAS-compact", "TMD3", "ATLAS-netcdf"):
         deltat = np.zeros_like(t)
-
-    elif model.format in ("GOT-ascii", "GOT-netcdf"):
-        amp, ph, c = pyTMD.io.GOT.extract_constants(
-            lon,
-            lat,
-            model.model_file,
-            method=method,
-            crop=crop,
-            extrapolate=extrapolate,
-            cutoff=cutoff,
-            scale=model.scale,
-            compressed=model.compressed,
-        )
-
-        # Interpolate delta times from calendar dates to tide time
-        deltat = timescale.time.interpolate_delta_time(delta_file, t)
-
-    elif model.format in ("FES-netcdf", "FES-ascii"):
-        amp, ph = pyTMD.io.FES.extract_constants(
-            lon,
-            lat,
-            model.model_file,
-            type=model.type,
-            crop=crop,
-            version=model.version,
-            method=method,
-            extrapolate=extrapolate,
-            cutoff=cutoff,
-            scale=model.scale,
-            compressed=model.compressed,
-        )
-
-        # Available model constituents
-        c = model.constituents
-
+    else:
         # Interpolate delta times from calendar dates to tide time
         deltat = timescale.time.interpolate_delta_time(delta_file, t)
 
@@ -250,41 +520,97 @@ def model_tides(
     # Calculate constituent oscillation
     hc = amp * np.exp(cph)
 
-    # Repeat constituents to length of time and number of input
-    # coords before passing to `pyTMD.predict.map`
-    t, hc, deltat = (
-        np.tile(t, n_points),
-        hc.repeat(n_times, axis=0),
-        np.tile(deltat, n_points),
-    )
-
-    # Predict tidal elevations at time and infer minor corrections
-    npts = len(t)
-    tide = np.ma.zeros((npts), fill_value=np.nan)
-    tide.mask = np.any(hc.mask, axis=1)
-
-    # TODO find which predict methods best matches previously used predict_tide_drift
-    # pyTMD.predict.map
-    # pyTMD.predict.time_series
-    # pyTMD.predict.drift
-    tide.data[:] = pyTMD.predict.drift(t, hc, c, deltat=deltat, corrections=model.format)
-    minor = pyTMD.predict.infer_minor(t, hc, c, deltat=deltat, corrections=model.format)
-    tide.data[:] += minor.data[:]
+    # Predict tidal elevations for every time and point as a dense
+    # (time, point) array, processing times in fixed-size blocks
+    tide = _predict_tides_blocked(t, hc, c, deltat, model.format, time_block_size)
 
-    # Replace invalid values with fill value
-    tide.data[tide.mask] = tide.fill_value
+    # Return dense array directly if requested
+    if output_format == "array":
+        return tide
 
-    # Export data as a dataframe
+    # Otherwise export data as a long-format dataframe
     return pd.DataFrame(
         {
             "time": np.tile(time, n_points),
             "x": np.repeat(x, n_times),
             "y": np.repeat(y, n_times),
-            "tide_m": tide,
+            "tide_m": tide.T.ravel(),
         }
     ).set_index("time")
 
 
+def _predict_tides_blocked(t, hc, c, deltat, corrections, time_block_size=1000):
+    """
+    Predict tide heights for every combination of time and point.
+
+    Tide heights (including inferred minor constituents) are linear in
+    the real and imaginary parts of the constituent oscillations `hc`.
+    For each block of times, `pyTMD` is therefore only used to evaluate
+    the response of every time to a unit real and a unit imaginary
+    oscillation of each constituent. Tides for all points are then
+    obtained as a (points x constituents) @ (constituents x times)
+    matrix product, avoiding (points x times x constituents) arrays.
+
+    Parameters
+    ----------
+    t : numpy.ndarray
+        Times in days relative to 1992-01-01.
+    hc : numpy.ma.MaskedArray
+        Complex constituent oscillations with shape (points, constituents).
+    c : list
+        Constituent names.
+    deltat : numpy.ndarray
+        Delta times (TT - UT1) for each time in `t`.
+    corrections : str
+        Nodal corrections type passed to `pyTMD.predict`.
+    time_block_size : int, optional
+        The number of times processed together. Defaults to 1000.
+
+    Returns
+    -------
+    tide : numpy.ndarray
+        A float array with shape (times, points), containing NaN
+        for points where the constituents are invalid.
+    """
+    n_times = len(t)
+    n_const = hc.shape[1]
+
+    # Unit real and imaginary oscillations for each constituent
+    unit_hc = np.ma.array(
+        np.concatenate([np.eye(n_const), 1j * np.eye(n_const)]),
+        mask=False,
+    )
+
+    hc_real = np.ma.getdata(hc).real
+    hc_imag = np.ma.getdata(hc).imag
+    tide = np.empty((n_times, hc.shape[0]), dtype=np.float64)
+
+    for start in range(0, n_times, time_block_size):
+        t_block = t[start : start + time_block_size]
+        deltat_block = deltat[start : start + time_block_size]
+        n_block = len(t_block)
+
+        # Evaluate every unit oscillation at every time in the block
+        t_rep = np.tile(t_block, 2 * n_const)
+        deltat_rep = np.tile(deltat_block, 2 * n_const)
+        hc_rep = unit_hc.repeat(n_block, axis=0)
+        basis = pyTMD.predict.drift(t_rep, hc_rep, c, deltat=deltat_rep, corrections=corrections)
+        minor = pyTMD.predict.infer_minor(
+            t_rep, hc_rep, c, deltat=deltat_rep, corrections=corrections
+        )
+        basis = (np.ma.getdata(basis) + np.ma.getdata(minor)).reshape(2 * n_const, n_block)
+
+        # Combine responses with each point's constituents
+        tide[start : start + n_block] = (basis[:n_const].T @ hc_real.T) + (
+            basis[n_const:].T @ hc_imag.T
+        )
+
+    # Replace invalid values with NaN
+    tide[:, np.any(np.ma.getmaskarray(hc), axis=1)] = np.nan
+
+    return tide
+
+
 def pixel_tides(
     ds,
     times=None,
@@ -293,6 +619,7 @@ def pixel_tides(
     resolution=None,
     buffer=None,
     resample_method="bilinear",
+    dask_chunks=None,
     **model_tides_kwargs,
 ):
     """
@@ -347,6 +674,17 @@ def pixel_tides(
         resampling method when converting from low resolution to high
         resolution pixels. Defaults to "bilinear"; valid options include
         "nearest", "cubic", "min", "max", "average" etc.
+    dask_chunks : dict, optional
+        If provided, tides are modelled lazily using Dask. The
+        low-resolution grid is split into chunks of this many
+        low-resolution pixels and timesteps (e.g.
+        `{"time": 100, "x": 20, "y": 20}`), and each chunk is modelled
+        as a separate task that can run in parallel on a Dask cluster.
+        Any dimension not provided is not split. If `resample` is True,
+        the high resolution output is also a lazy Dask array which is
+        reprojected chunk by chunk, using the spatial chunks of `ds` if
+        it is a Dask-backed dataset. Defaults to None, which models all
+        tides immediately.
     **model_tides_kwargs :
         Optional parameters passed to the `dea_tools.coastal.model_tides`
         function. Important parameters include "model" and "directory",
@@ -452,40 +790,56 @@ def pixel_tides(
     rescaled_geobox = GeoBox.from_bbox(bbox=buffered_geobox.boundingbox, resolution=resolution)
     rescaled_ds = odc.geo.xr.xr_zeros(rescaled_geobox)
 
-    # Flatten grid to 1D, then add time dimension
-    flattened_ds = rescaled_ds.stack(z=(x_dim, y_dim))
-    flattened_ds = flattened_ds.expand_dims(dim={"time": time_coords.values})
-
-    # Model tides for each timestep
     model = "FES2014" if "model" not in model_tides_kwargs else model_tides_kwargs["model"]
-    print(f"Modelling tides using {model} tide model")
-    tide_df = model_tides(
-        x=flattened_ds[x_dim],
-        y=flattened_ds[y_dim],
-        time=flattened_ds.time,
-        epsg=ds.odc.geobox.crs.epsg,
-        **model_tides_kwargs,
-    )
 
-    # Rename x and y coordinates to match satellite array
-    tide_df = tide_df.rename({"x": x_dim, "y": y_dim}, axis=1)
-
-    # Insert modelled tide values back into flattened array, then unstack
-    # back to 3D (y, x, time)
-    tides_lowres = (
-        # Convert dataframe to xarray format
-        tide_df.set_index([x_dim, y_dim], append=True)
-        .to_xarray()
-        # Re-index and transpose back into 3D
-        .tide_m.reindex_like(rescaled_ds)
-        .transpose("time", y_dim, x_dim)
-        .astype(np.float32)
-    )
+    # Model tides lazily in chunks of the low resolution grid
+    if dask_chunks is not None:
+        print(f"Setting up lazy tide modelling using {model} tide model")
+        tides_lowres = _pixel_tides_dask(
+            rescaled_ds,
+            time_coords.values,
+            dask_chunks,
+            ds.odc.geobox.crs.epsg,
+            **model_tides_kwargs,
+        )
+
+    else:
+        # Flatten grid to 1D
+        flattened_ds = rescaled_ds.stack(z=(x_dim, y_dim))
+
+        # Model tides for each timestep, returned as a dense (time, point) array
+        print(f"Modelling tides using {model} tide model")
+        tide_array = model_tides(
+            x=flattened_ds[x_dim].values,
+            y=flattened_ds[y_dim].values,
+            time=time_coords.values,
+            epsg=ds.odc.geobox.crs.epsg,
+            output_format="array",
+            **model_tides_kwargs,
+        )
+
+        # Insert modelled tide values back into flattened array, then unstack
+        # back to 3D (y, x, time)
+        tides_lowres = (
+            xr.DataArray(
+                tide_array.astype(np.float32),
+                coords={"time": time_coords.values, "z": flattened_ds.z},
+                dims=["time", "z"],
+                name="tide_m",
+            )
+            .unstack("z")
+            # Re-index and transpose back into 3D
+            .reindex_like(rescaled_ds)
+            .transpose("time", y_dim, x_dim)
+        )
 
     # Optionally calculate and return quantiles rather than raw data
     if calculate_quantiles is not None:
 
         print("Computing tide quantiles")
+        if dask_chunks is not None:
+            # Quantiles require a single chunk along time
+            tides_lowres = tides_lowres.chunk({"time": -1})
         tides_lowres = tides_lowres.quantile(q=calculate_quantiles, dim="time")
         reproject_dim = "quantile"
 
@@ -498,14 +852,28 @@ def pixel_tides(
     # Reproject each timestep into original high resolution grid
     if resample:
 
-        print("Reprojecting tides into original array")
-        tides_highres = parallel_apply(
-            tides_lowres,
-            reproject_dim,
-            odc.algo.xr_reproject,
-            ds.odc.geobox.compat,
-            resample_method,
-        )
+        if dask_chunks is not None:
+            # Reproject lazily, one output chunk at a time
+            print("Setting up lazy reprojection of tides into original array")
+            chunks = None
+            if ds.chunks:
+                chunks = (ds.chunks[y_dim][0], ds.chunks[x_dim][0])
+            tides_highres = odc.algo.xr_reproject(
+                tides_lowres,
+                ds.odc.geobox.compat,
+                resampling=resample_method,
+                chunks=chunks,
+            )
+
+        else:
+            print("Reprojecting tides into original array")
+            tides_highres = parallel_apply(
+                tides_lowres,
+                reproject_dim,
+                odc.algo.xr_reproject,
+                ds.odc.geobox.compat,
+                resample_method,
+            )
 
         return tides_highres, tides_lowres
 
@@ -514,6 +882,71 @@ def pixel_tides(
         return tides_lowres
 
 
+def _model_tides_block(x, y, time, epsg, model_tides_kwargs):
+    """
+    Model tides for one chunk of the `pixel_tides` low resolution grid,
+    given 1D arrays of the chunk's x and y coordinates and times.
+
+    Returns
+    -------
+    A float32 numpy.ndarray with shape (time, y, x).
+    """
+    xx, yy = np.meshgrid(x, y)
+    tides = model_tides(
+        x=xx.ravel(),
+        y=yy.ravel(),
+        time=time,
+        epsg=epsg,
+        output_format="array",
+        **model_tides_kwargs,
+    )
+    return tides.reshape(len(time), len(y), len(x)).astype(np.float32)
+
+
+def _pixel_tides_dask(rescaled_ds, times, dask_chunks, epsg, **model_tides_kwargs):
+    """
+    Build a lazy (time, y, x) array of tides for the low resolution
+    grid `rescaled_ds`, with one Dask task per chunk of `dask_chunks`.
+    """
+    y_dim, x_dim = rescaled_ds.odc.spatial_dims
+    x = rescaled_ds[x_dim].values
+    y = rescaled_ds[y_dim].values
+
+    def _slices(size, chunk):
+        chunk = size if chunk in (None, -1) else chunk
+        return [slice(i, min(i + chunk, size)) for i in range(0, size, chunk)]
+
+    time_slices = _slices(len(times), dask_chunks.get("time"))
+    y_slices = _slices(len(y), dask_chunks.get(y_dim))
+    x_slices = _slices(len(x), dask_chunks.get(x_dim))
+
+    blocks = []
+    for ts in time_slices:
+        rows = []
+        for ys in y_slices:
+            cols = []
+            for xs in x_slices:
+                block = dask.delayed(_model_tides_block)(
+                    x[xs], y[ys], times[ts], epsg, model_tides_kwargs
+                )
+                cols.append(
+                    da.from_delayed(
+                        block,
+                        shape=(ts.stop - ts.start, ys.stop - ys.start, xs.stop - xs.start),
+                        dtype=np.float32,
+                    )
+                )
+            rows.append(cols)
+        blocks.append(rows)
+
+    return xr.DataArray(
+        da.block(blocks),
+        coords={"time": times, y_dim: rescaled_ds[y_dim], x_dim: rescaled_ds[x_dim]},
+        dims=["time", y_dim, x_dim],
+        name="tide_m",
+    )
+
+
 def tidal_tag(
     ds,
     ebb_flow=False,
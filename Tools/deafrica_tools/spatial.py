@@ -10,7 +10,9 @@ import geopandas as gpd
 import numpy as np
 import odc.geo.xr  # adds  `.odc.x` attributes to our xarray objects.
 import pandas as pd
+import rasterio
 import rasterio.features
+import rasterio.windows
 import scipy.interpolate
 import xarray as xr
 from datacube.api.query import query_group_by
@@ -22,6 +24,8 @@ from rasterstats import zonal_stats
 from shapely.geometry import LineString, MultiLineString, mapping, shape
 from skimage.measure import find_contours, label
 
+from deafrica_tools.datahandling import find_datasets_cached
+
 
 def add_geobox(ds, crs=None):
     """
@@ -783,6 +787,233 @@ def zonal_stats_parallel(shp, raster, statistics, out_shp, ncpus, **kwargs):
         write_output(zones, out_shp, d)
 
 
+# Statistics supported by `zonal_stats_blocks`. These can all be
+# computed from partial results for each raster block.
+_BLOCK_ZONAL_STATS = ("count", "sum", "mean", "min", "max", "std", "range")
+
+# Per-process raster dataset for the `zonal_stats_blocks` worker pool
+_zonal_stats_worker_state = {}
+
+
+def _init_zonal_stats_worker(raster, band):
+    """
+    Initializer for the `zonal_stats_blocks` worker pool, opening the
+    raster once per worker process.
+    """
+    _zonal_stats_worker_state["src"] = rasterio.open(raster)
+    _zonal_stats_worker_state["band"] = band
+
+
+def _zonal_stats_block(task):
+    """
+    Read a single raster window and compute partial zonal statistics
+    for every polygon intersecting it.
+
+    Parameters
+    ----------
+    task : tuple
+        A rasterio.windows.Window, followed by an array of polygon
+        positions and a list of the corresponding geometries.
+
+    Returns
+    -------
+    tuple
+        The polygon positions, then the count, sum, sum of squares,
+        minimum and maximum of the valid pixels of each polygon.
+    """
+    window, positions, geoms = task
+    src = _zonal_stats_worker_state["src"]
+    band = _zonal_stats_worker_state["band"]
+
+    data = src.read(band, window=window).astype(np.float64)
+
+    # Burn 1-based indices into `positions` so 0 means no polygon
+    ids = rasterio.features.rasterize(
+        zip(geoms, range(1, len(geoms) + 1)),
+        out_shape=data.shape,
+        transform=src.window_transform(window),
+        fill=0,
+        dtype="int32",
+    )
+
+    valid = (ids > 0) & np.isfinite(data)
+    if src.nodata is not None:
+        valid &= data != src.nodata
+
+    ids = ids[valid] - 1
+    values = data[valid]
+    n = len(geoms)
+
+    count = np.bincount(ids, minlength=n)
+    total = np.bincount(ids, weights=values, minlength=n)
+    total_sq = np.bincount(ids, weights=values * values, minlength=n)
+    minimum = np.full(n, np.inf)
+    maximum = np.full(n, -np.inf)
+    np.minimum.at(minimum, ids, values)
+    np.maximum.at(maximum, ids, values)
+
+    return positions, count, total, total_sq, minimum, maximum
+
+
+def zonal_stats_blocks(
+    gdf,
+    raster,
+    statistics=["count", "mean", "min", "max"],
+    ncpus=1,
+    band=1,
+    tile_size=1024,
+    output_path=None,
+):
+    """
+    Summarizing a raster dataset based on vector geometries, reading
+    each block of the raster only once.
+
+    The raster is split into tiles that are aligned with its internal
+    blocks, and polygons are grouped by the tiles they intersect. Each
+    tile is read once, polygon ids are burnt into it with
+    `rasterio.features.rasterize`, and grouped statistics are calculated
+    for all polygons at once with `np.bincount`. Partial statistics from
+    polygons spanning several tiles are then combined. This is much
+    faster than `zonal_stats_parallel` when summarising many polygons.
+
+    Only statistics that can be combined across tiles are supported.
+    Pixels are assigned to polygons using rasterio's default (pixel
+    centre) rule. Where polygons overlap, shared pixels are only
+    counted for one of them.
+
+    Parameters
+    ----------
+    gdf : geopandas.GeoDataFrame or str
+        The polygons over which zonal statistics are calculated,
+        or a path to a vector file containing them.
+    raster : str
+        Path to the raster from which the statistics are calculated.
+        This can be a virtual raster (.vrt).
+    statistics : list, optional
+        list of statistics to calculate. Supported values are
+        'count', 'sum', 'mean', 'min', 'max', 'std' and 'range'.
+        Defaults to ['count', 'mean', 'min', 'max'].
+    ncpus : int, optional
+        number of processes to read and summarise tiles with.
+        Defaults to 1.
+    band : int, optional
+        The raster band to summarise. Defaults to 1.
+    tile_size : int, optional
+        The approximate size in pixels of the tiles that the raster
+        is read in. Tiles are rounded to a whole number of the
+        raster's internal blocks. Defaults to 1024.
+    output_path : str, optional
+        An optional path to export the results to. Paths ending in
+        '.parquet' are written with `GeoDataFrame.to_parquet`, others
+        with `GeoDataFrame.to_file`.
+
+    Returns
+    -------
+    geopandas.GeoDataFrame
+        A copy of the input polygons with a new column for each statistic.
+    """
+    for stat in statistics:
+        if stat not in _BLOCK_ZONAL_STATS:
+            raise ValueError(
+                f"{stat} is not one of the supported statistics {_BLOCK_ZONAL_STATS}. "
+                "Use `zonal_stats_parallel` for other statistics."
+            )
+
+    if isinstance(gdf, str):
+        gdf = gpd.read_file(gdf)
+
+    with rasterio.open(raster) as src:
+        geoms = gdf.to_crs(src.crs).geometry.values
+        transform = src.transform
+        height, width = src.height, src.width
+        block_h, block_w = src.block_shapes[band - 1]
+
+    # Tiles are a whole number of the raster's internal blocks
+    tile_h = max(1, tile_size // block_h) * block_h
+    tile_w = max(1, tile_size // block_w) * block_w
+
+    # Find the range of tiles intersected by each polygon's bounds
+    bounds = np.array([geom.bounds if geom is not None else [np.nan] * 4 for geom in geoms])
+    cols_a, rows_a = ~transform * (bounds[:, 0], bounds[:, 3])
+    cols_b, rows_b = ~transform * (bounds[:, 2], bounds[:, 1])
+    row_min = np.clip(np.floor(np.minimum(rows_a, rows_b)), 0, height - 1)
+    row_max = np.clip(np.floor(np.maximum(rows_a, rows_b)), 0, height - 1)
+    col_min = np.clip(np.floor(np.minimum(cols_a, cols_b)), 0, width - 1)
+    col_max = np.clip(np.floor(np.maximum(cols_a, cols_b)), 0, width - 1)
+
+    # Group polygons by tile
+    tiles = {}
+    for i in range(len(geoms)):
+        if geoms[i] is None or geoms[i].is_empty or np.isnan(row_min[i]):
+            continue
+        for tr in range(int(row_min[i]) // tile_h, int(row_max[i]) // tile_h + 1):
+            for tc in range(int(col_min[i]) // tile_w, int(col_max[i]) // tile_w + 1):
+                tiles.setdefault((tr, tc), []).append(i)
+
+    tasks = []
+    for (tr, tc), positions in sorted(tiles.items()):
+        window = rasterio.windows.Window(
+            tc * tile_w,
+            tr * tile_h,
+            min(tile_w, width - tc * tile_w),
+            min(tile_h, height - tr * tile_h),
+        )
+        tasks.append((window, np.array(positions), [geoms[i] for i in positions]))
+
+    # Combine partial statistics from each tile
+    n = len(geoms)
+    count = np.zeros(n)
+    total = np.zeros(n)
+    total_sq = np.zeros(n)
+    minimum = np.full(n, np.inf)
+    maximum = np.full(n, -np.inf)
+
+    def _combine(result):
+        positions, t_count, t_total, t_total_sq, t_min, t_max = result
+        np.add.at(count, positions, t_count)
+        np.add.at(total, positions, t_total)
+        np.add.at(total_sq, positions, t_total_sq)
+        np.minimum.at(minimum, positions, t_min)
+        np.maximum.at(maximum, positions, t_max)
+
+    if ncpus > 1:
+        with mp.Pool(ncpus, initializer=_init_zonal_stats_worker, initargs=(raster, band)) as pool:
+            for result in pool.imap_unordered(_zonal_stats_block, tasks):
+                _combine(result)
+    else:
+        _init_zonal_stats_worker(raster, band)
+        try:
+            for task in tasks:
+                _combine(_zonal_stats_block(task))
+        finally:
+            _zonal_stats_worker_state.pop("src").close()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        empty = count == 0
+        mean = total / count
+        results = {
+            "count": count.astype(int),
+            "sum": np.where(empty, np.nan, total),
+            "mean": mean,
+            "min": np.where(empty, np.nan, minimum),
+            "max": np.where(empty, np.nan, maximum),
+            "std": np.sqrt(np.maximum(total_sq / count - mean * mean, 0)),
+            "range": np.where(empty, np.nan, maximum - minimum),
+        }
+
+    out_gdf = gdf.copy()
+    for stat in statistics:
+        out_gdf[stat] = results[stat]
+
+    if output_path is not None:
+        if output_path.endswith(".parquet"):
+            out_gdf.to_parquet(output_path)
+        else:
+            out_gdf.to_file(output_path)
+
+    return out_gdf
+
+
 def reverse_geocode(coords, site_classes=None, state_classes=None):
     """
     Takes a latitude and longitude coordinate, and performs a reverse
@@ -879,7 +1110,7 @@ def reverse_geocode(coords, site_classes=None, state_classes=None):
         return f"{lat}, {lon}"
 
 
-def sun_angles(dc, query):
+def sun_angles(dc, query, cache=False, cache_dir=None):
     """
     For a given spatiotemporal query, calculate mean sun
     azimuth and elevation for each satellite observation, and
@@ -893,6 +1124,12 @@ def sun_angles(dc, query):
     query : dict
         A dictionary containing query parameters used to identify
         satellite observations and load metadata.
+    cache : bool, optional
+        Whether to re-use cached dataset search results for this query
+        (see `deafrica_tools.datahandling.find_datasets_cached`).
+        Defaults to False.
+    cache_dir : str, optional
+        An optional directory used to persist cached dataset searches.
 
     Returns:
     --------
@@ -903,7 +1140,7 @@ def sun_angles(dc, query):
     # Identify satellite datasets and group outputs using the
     # same approach used to group satellite imagery (i.e. solar day)
     gb = query_group_by(**query)
-    datasets = dc.find_datasets(**query)
+    datasets = find_datasets_cached(dc, cache=cache, cache_dir=cache_dir, **query)
     dataset_array = dc.group_datasets(datasets, gb)
 
     # Load and take the mean of metadata from each product
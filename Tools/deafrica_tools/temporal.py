@@ -19,6 +19,7 @@ The key functions are:
 """
 
 import sys
+import warnings
 import dask
 import numpy as np
 import xarray as xr
@@ -26,193 +27,126 @@ import hdstats
 from packaging import version
 from datacube.utils.geometry import assign_crs
 
+from deafrica_tools.datahandling import scaled_int16_to_float
 
-def allNaN_arg(da, dim, stat):
-    """
-    Calculate da.argmax() or da.argmin() while handling
-    all-NaN slices. Fills all-NaN locations with an
-    float and then masks the offending cells.
 
-    Parameters
-    ----------
-    da : xarray.DataArray
-    dim : str
-        Dimension over which to calculate argmax, argmin e.g. 'time'
-    stat : str
-        The statistic to calculte, either 'min' for argmin()
-        or 'max' for .argmax()
+# Order and dtypes of the statistics returned by `_phenology_kernel`
+_PHENOLOGY_STATS = {
+    "SOS": np.dtype("<M8[ns]"),
+    "POS": np.dtype("<M8[ns]"),
+    "EOS": np.dtype("<M8[ns]"),
+    "Trough": np.float32,
+    "vSOS": np.float32,
+    "vPOS": np.float32,
+    "vEOS": np.float32,
+    "LOS": np.float32,
+    "AOS": np.float32,
+    "ROG": np.float32,
+    "ROS": np.float32,
+}
 
-    Returns
-    -------
-    xarray.DataArray
-    """
-    # Generate a mask where the entire axis along dimension is NaN.
-    mask = da.isnull().all(dim)
-
-    if stat == "max":
-        # Generate the fill value for the all-NaN pixels. 
-        fill_value = float(da.min() - 1)
-        # Fill the all-NaN pixels.
-        y = xr.where(mask, fill_value, da)
-        y = y.argmax(dim=dim, skipna=True)
-        return mask, y
-
-    if stat == "min":
-        # Generate the fill value for the all-NaN pixels. 
-        fill_value = float(da.max() + 1)
-        # Fill the all-NaN pixels.
-        y = xr.where(mask, fill_value, da)
-        y = y.argmin(dim=dim, skipna=True)
-        return mask, y
-
-
-def _vpos(da):
-    """
-    vPOS = Value at peak of season
-    """
-    return da.max("time")
 
-
-def _pos(da):
-    """
-    POS = Date of peak of season
+def _season_edge(season, times_num, method, keep):
     """
-    return da.isel(time=da.argmax("time")).time
-
-
-def _trough(da):
-    """
-    Trough = Minimum value
-    """
-    return da.min("time")
-
+    Find the value and time index at the start or end of season from
+    the values on one side of the peak of season (`season`, which is
+    NaN elsewhere), with time along the last axis. The value closest
+    to (or, for "first", furthest below) the median slope value is used.
 
-def _aos(vpos, trough):
+    `keep` selects which first order slopes are retained: "positive"
+    for the greening side, "nonzero" for the senescing side.
     """
-    AOS = Amplitude of season
-    """
-    return vpos - trough
+    deriv = np.gradient(season, times_num, axis=-1)
+    if keep == "positive":
+        slopes = np.where(deriv > 0, season, np.nan)
+    else:
+        slopes = np.where(deriv != 0, season, np.nan)
 
+    distance = slopes - np.nanmedian(slopes, axis=-1, keepdims=True)
+    if method == "median":
+        distance = np.fabs(distance)
 
-def _vsos(da, pos, method_sos="first"):
-    """
-    vSOS = Value at the start of season
-    Params
-    -----
-    da : xarray.DataArray
-    method_sos : str,
-        If 'first' then vSOS is estimated
-        as the first positive slope on the
-        greening side of the curve. If 'median',
-        then vSOS is estimated as the median value
-        of the postive slopes on the greening side
-        of the curve.
-    """
-    # select timesteps before peak of season (AKA greening)
-    greenup = da.where(da.time < pos.time)
-    # find the first order slopes
-    green_deriv = greenup.differentiate("time")
-    # find where the first order slope is postive
-    pos_green_deriv = green_deriv.where(green_deriv > 0)
-    # positive slopes on greening side
-    pos_greenup = greenup.where(~np.isnan(pos_green_deriv))
-    # find the median
-    median = pos_greenup.median("time")
-    # distance of values from median
-    distance = pos_greenup - median
-
-    if method_sos == "first":
-        # Find the time index (argmin) where the distance of values from the median is most negative.
-        mask, idx = allNaN_arg(distance, "time", "min")
-        idx = idx.astype("int16")
-
-    if method_sos == "median":
-        # Find the time index (argmin) where the distance of values from median is the smallest absolute value.
-        mask, idx = allNaN_arg(np.fabs(distance), "time", "min")
-        idx = idx.astype("int16")
-                         
-    return pos_greenup.isel(time=idx).where(~mask) # mask the all-NaN pixels 
-
-
-def _sos(vsos):
-    """
-    SOS = Date for start of season
-    """
-    return vsos.time
+    mask = np.isnan(distance).all(axis=-1)
+    idx = np.argmin(np.where(np.isnan(distance), np.inf, distance), axis=-1)
+    value = np.take_along_axis(slopes, idx[..., None], axis=-1)[..., 0]
+    value[mask] = np.nan
 
-
-def _veos(da, pos, method_eos="last"):
-    """
-    vEOS = Value at the end of season
-    Params
-    -----
-    method_eos : str
-        If 'last' then vEOS is estimated
-        as the last negative slope on the
-        senescing side of the curve. If 'median',
-        then vEOS is estimated as the 'median' value
-        of the negative slopes on the senescing
-        side of the curve.
-    """
-    # select timesteps after peak of season (AKA greening)
-    senesce = da.where(da.time > pos.time)
-    # find the first order slopes
-    senesce_deriv = senesce.differentiate("time")
-    # find where the fst order slope is negative
-    neg_senesce_deriv = senesce_deriv.where(~np.isnan(senesce_deriv < 0))
-    # negative slopes on senescing side
-    neg_senesce = senesce.where(neg_senesce_deriv)
-    # find medians
-    median = neg_senesce.median("time")
-    # distance to the median
-    distance = neg_senesce - median
-
-    if method_eos == "last":
-        # Find the time index (argmin) where the last negative slope occurs.
-        mask, idx = allNaN_arg(distance, "time", "min")
-        idx = idx.astype("int16")
-
-    if method_eos == "median":
-        # Find the time index (argmin) where the median occurs.
-        mask, idx = allNaN_arg(np.fabs(distance), "time", "min")
-        idx = idx.astype("int16")
-
-    return neg_senesce.isel(time=idx).where(~mask) # mask the all-NaN pixels 
-
-
-def _eos(veos):
-    """
-    EOS = Date for end of season
-    """
-    return veos.time
+    return value, idx
 
 
-def _los(da, eos, sos):
+def _phenology_kernel(values, times, method_sos="first", method_eos="last"):
     """
-    LOS = Length of season (Days)
-    """
-    los = (eos - sos).dt.days
-    #handle negative values
-    los = xr.where(
-        los >= 0,
-        los,
-        (da.time.dt.dayofyear.values[-1] + (eos.where(los < 0) - sos.where(los < 0))).dt.days
-    )
-    return los
-
+    Compute all phenology statistics in a single pass over a numpy
+    array with time along the last axis. Used by `xr_phenology` on
+    each (y, x, time) block of the input.
 
-def _rog(vpos, vsos, pos, sos):
-    """
-    ROG = Rate of Greening (Days)
+    Returns
+    -------
+    tuple of numpy.ndarray
+        One array per statistic in the order of `_PHENOLOGY_STATS`.
     """
-    return (vpos - vsos) / (pos - sos).dt.days
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+
+        # Deal with any all-NaN pixels by filling with 0's.
+        all_nan = np.isnan(values).all(axis=-1)
+        values = np.where(all_nan[..., None], 0, values).astype(np.float64)
+
+        times = times.astype("datetime64[ns]")
+        times_num = (times - times[0]).astype(np.float64)
+
+        # Peak and trough
+        vpos = np.nanmax(values, axis=-1)
+        pos = times[np.nanargmax(values, axis=-1)]
+        trough = np.nanmin(values, axis=-1)
+        aos = vpos - trough
+
+        # Start and end of season from either side of the peak
+        if len(times) > 1:
+            greenup = np.where(times < pos[..., None], values, np.nan)
+            vsos, sos_idx = _season_edge(greenup, times_num, method_sos, "positive")
+            senesce = np.where(times > pos[..., None], values, np.nan)
+            veos, eos_idx = _season_edge(senesce, times_num, method_eos, "nonzero")
+        else:
+            vsos = veos = np.full(vpos.shape, np.nan)
+            sos_idx = eos_idx = np.zeros(vpos.shape, dtype=int)
+        sos = times[sos_idx]
+        eos = times[eos_idx]
+
+        # Length of season, offsetting negative lengths by the day of
+        # year of the last observation (added in ns, matching the
+        # original xarray implementation)
+        one_day = np.timedelta64(1, "D")
+        last_doy = (times[-1].astype("<M8[D]") - times[-1].astype("<M8[Y]")).astype(int) + 1
+        los = eos - sos
+        los = np.where(los < np.timedelta64(0), los + np.timedelta64(last_doy, "ns"), los)
+        los = los // one_day
+
+        # Rates of greening and senescence
+        rog = (vpos - vsos) / ((pos - sos) // one_day)
+        ros = (veos - vpos) / ((eos - pos) // one_day)
+
+        outputs = {
+            "SOS": sos,
+            "POS": pos,
+            "EOS": eos,
+            "Trough": trough,
+            "vSOS": vsos,
+            "vPOS": vpos,
+            "vEOS": veos,
+            "LOS": los,
+            "AOS": aos,
+            "ROG": rog,
+            "ROS": ros,
+        }
 
+        # Set original all-NaN pixels back to NaN.
+        for stat, dtype in _PHENOLOGY_STATS.items():
+            out = np.asarray(outputs[stat]).astype(dtype)
+            out[all_nan] = np.datetime64("NaT") if out.dtype.kind == "M" else np.nan
+            outputs[stat] = out
 
-def _ros(veos, vpos, eos, pos):
-    """
-    ROG = Rate of Senescing (Days)
-    """
-    return (veos - vpos) / (eos - pos).dt.days
+    return tuple(outputs[stat] for stat in _PHENOLOGY_STATS)
 
 
 def xr_phenology(
@@ -239,13 +173,20 @@ def xr_phenology(
     xarray.DataArray containing a timeseries of a
     vegetation index like NDVI.
 
-    last modified June 2023
+    All statistics are computed together in a single vectorised
+    pass over the data. Dask-backed arrays are processed lazily,
+    one (y, x) chunk at a time, so each chunk must hold the full
+    time series (the input is rechunked along time if needed).
+
+    last modified October 2026
 
     Parameters
     ----------
     da :  xarray.DataArray
         DataArray should contain a 2D or 3D time series of a
-        vegetation index like NDVI, EVI
+        vegetation index like NDVI, EVI. Compact scaled integer
+        data (i.e. from ``load_ard(dtype="scaled_int16")``) is
+        converted to floating point automatically.
     stats : list
         list of phenological statistics to return. Regardless of
         the metrics returned, all statistics are calculated
@@ -282,54 +223,6 @@ def xr_phenology(
         phenology statistics
 
     """
-    # Check inputs before running calculations
-    if dask.is_dask_collection(da):
-        if version.parse(xr.__version__) < version.parse("0.16.0"):
-            raise TypeError(
-                "Dask arrays are not currently supported by this function, "
-                + "run da.compute() before passing dataArray."
-            )
-        stats_dtype = {
-            "SOS": np.dtype('<M8[ns]'),
-            "POS": np.dtype('<M8[ns]'),
-            "EOS": np.dtype('<M8[ns]'),
-            "Trough": np.float32,
-            "vSOS": np.float32,
-            "vPOS": np.float32,
-            "vEOS": np.float32,
-            "LOS": np.int16,
-            "AOS": np.float32,
-            "ROG": np.float32,
-            "ROS": np.float32,
-        }
-        da_template = da.isel(time=0).drop("time")
-        template = xr.Dataset(
-            {
-                var_name: da_template.astype(var_dtype)
-                for var_name, var_dtype in stats_dtype.items()
-                if var_name in stats
-            }
-        )
-        da_all_time = da.chunk({"time": -1})
-
-        lazy_phenology = da_all_time.map_blocks(
-            xr_phenology,
-            kwargs=dict(
-                stats=stats,
-                method_sos=method_sos,
-                method_eos=method_eos,
-            ),
-            template=xr.Dataset(template),
-        )
-
-        try:
-            crs = da.geobox.crs
-            lazy_phenology = assign_crs(lazy_phenology, str(crs))
-        except:
-            pass
-
-        return lazy_phenology
-
     if method_sos not in ("median", "first"):
         raise ValueError("method_sos should be either 'median' or 'first'")
 
@@ -339,57 +232,37 @@ def xr_phenology(
     # If stats supplied is not a list, convert to list.
     stats = stats if isinstance(stats, list) else [stats]
 
+    # Apply scale/offset and nodata to compact scaled integer data
+    da = scaled_int16_to_float(da)
+
     # try to grab the crs info
     try:
         crs = da.geobox.crs
     except:
-        pass
+        crs = None
 
-    # Deal with any all-NaN pixels by filling with 0's.
-    da_all_nan_mask = da.isnull().all("time")
-    da = da.where(~da_all_nan_mask, other=0)
-    
-    # Create a template to use when handling errors calculating statistics.
-    xr_template = xr.full_like(da.isel(time=0).drop("time"), fill_value=np.nan, dtype=np.float32)
-    # Create time coordinates for the template. 
-    time_coords = xr.full_like(da.isel(time=0).drop("time"), fill_value=np.nan, dtype="datetime64[ns]")
-    time_coords.attrs = {'units': 'seconds since 1970-01-01 00:00:00'}
-    
-    # calculate the statistics
+    # Dask arrays are processed block by block, which requires
+    # each block to contain the full time series
+    if dask.is_dask_collection(da):
+        da = da.chunk({"time": -1})
+
+    # calculate all statistics in one pass over each block
     if verbose:
         print("      Phenology...")
-    vpos = _vpos(da)
-    pos = _pos(da)
-    trough = _trough(da)
-    aos = _aos(vpos, trough)
-    try:
-        vsos = _vsos(da, pos, method_sos=method_sos)
-    except:
-        vsos = xr_template.assign_coords(time=time_coords)
-    sos = _sos(vsos)
-    try:
-        veos = _veos(da, pos, method_eos=method_eos)
-    except:
-        veos = xr_template.assign_coords(time=time_coords)
-    eos = _eos(veos)
-    los = _los(da, eos, sos)
-    rog = _rog(vpos, vsos, pos, sos)
-    ros = _ros(veos, vpos, eos, pos)
-
-    # Dictionary containing the statistics
-    stats_dict = {
-        "SOS": sos.astype(np.dtype('<M8[ns]')),
-        "EOS": eos.astype(np.dtype('<M8[ns]')),
-        "vSOS": vsos.astype(np.float32),
-        "vPOS": vpos.astype(np.float32),
-        "Trough": trough.astype(np.float32),
-        "POS": pos.astype(np.dtype('<M8[ns]')),
-        "vEOS": veos.astype(np.float32),
-        "LOS": los.astype(np.int16),
-        "AOS": aos.astype(np.float32),
-        "ROG": rog.astype(np.float32),
-        "ROS": ros.astype(np.float32),
-    }
+    results = xr.apply_ufunc(
+        _phenology_kernel,
+        da,
+        kwargs=dict(
+            times=da.time.values,
+            method_sos=method_sos,
+            method_eos=method_eos,
+        ),
+        input_core_dims=[["time"]],
+        output_core_dims=[[] for _ in _PHENOLOGY_STATS],
+        dask="parallelized",
+        output_dtypes=list(_PHENOLOGY_STATS.values()),
+    )
+    stats_dict = dict(zip(_PHENOLOGY_STATS, results))
 
     # intialise dataset with first statistic
     ds = stats_dict[stats[0]].to_dataset(name=stats[0])
@@ -398,29 +271,192 @@ def xr_phenology(
     for stat in stats[1:]:
         if verbose:
             print("         " + stat)
-        stats_keep = stats_dict.get(stat)
         ds[stat] = stats_dict[stat]
-    
-    # Set original all-NaN pixels back to NaN.
-    ds = ds.where(~da_all_nan_mask)
-    
+
     # Try add back the crs.
+    if crs is not None:
+        ds = assign_crs(ds, str(crs))
+
+    return ds
+
+
+# Statistics supported by `temporal_statistics`, and those
+# returning three fourier layers (suffixed _n1, _n2, _n3)
+_TEMPORAL_STATS = (
+    "discordance",
+    "f_std",
+    "f_mean",
+    "f_median",
+    "mean_change",
+    "median_change",
+    "abs_change",
+    "complexity",
+    "central_diff",
+    "num_peaks",
+)
+_FOURIER_STATS = ("f_std", "f_median", "f_mean")
+
+
+def _number_peaks(x, n=10):
+    """
+    Vectorised peak counter used by `temporal_statistics` with
+    `engine="numpy"`. A peak is a value that is the maximum of the
+    window of `n` values either side of it, and greater than the
+    value immediately before it (so flat peaks are only counted once).
+    Windows are truncated at the ends of the time series.
+    """
+    from scipy.ndimage import maximum_filter1d
+
+    local_max = maximum_filter1d(x, size=2 * n + 1, axis=-1, mode="nearest")
+    rising = np.ones(x.shape, dtype=bool)
+    rising[..., 1:] = x[..., 1:] > x[..., :-1]
+    return np.count_nonzero((x == local_max) & rising, axis=-1)
+
+
+def _temporal_stats_kernel(x, mean_ts, stats):
+    """
+    Compute the requested temporal statistics in one pass over a numpy
+    array with time along the last axis. These are vectorised
+    equivalents of the hdstats functions used by `temporal_statistics`.
+    `mean_ts` is the spatial mean time series of the full array, used
+    for 'discordance'.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        One float32 array per output layer, in the order of `stats`,
+        with fourier statistics contributing three layers each. A
+        single array is returned if there is only one output layer.
+    """
+    outputs = []
+
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+
+        # Deal with any all-NaN pixels by filling with 0's.
+        all_nan = np.isnan(x).all(axis=-1)
+        x = np.where(all_nan[..., None], 0, x)
+
+        # shared intermediates, computed on first use
+        diff = np.diff(x, axis=-1) if any("change" in stat for stat in stats) else None
+        spectrum = None
+
+        for stat in stats:
+            if stat == "discordance":
+                # The mean of the low-pass filtered series equals the
+                # mean of the series, as the zero frequency term is kept
+                spec = np.fft.fft(mean_ts)
+                spec[10:] = 0.0
+                lowpass = np.abs(np.fft.ifft(spec)).astype(np.float32)
+                result = [np.mean(x, axis=-1) - np.mean(lowpass)]
+
+            elif stat in _FOURIER_STATS:
+                if spectrum is None:
+                    spectrum = np.abs(np.fft.fft(x, axis=-1))
+                func = {"f_std": np.std, "f_mean": np.mean, "f_median": np.median}[stat]
+                result = [
+                    func(spectrum[..., 1 + k * 5 : (k + 1) * 5 + 1], axis=-1) for k in range(3)
+                ]
+
+            elif stat == "mean_change":
+                result = [np.mean(diff, axis=-1)]
+
+            elif stat == "median_change":
+                result = [np.median(diff, axis=-1)]
+
+            elif stat == "abs_change":
+                result = [np.mean(np.abs(diff), axis=-1)]
+
+            elif stat == "complexity":
+                norm = (x - np.mean(x, axis=-1, keepdims=True)) / np.std(
+                    x, axis=-1, keepdims=True
+                )
+                norm_diff = np.diff(norm, axis=-1)
+                result = [np.sum(norm_diff * norm_diff, axis=-1)]
+
+            elif stat == "central_diff":
+                central = (x[..., :-2] - 2 * x[..., 1:-1] + x[..., 2:]) / 2.0
+                result = [np.mean(central, axis=-1)]
+
+            elif stat == "num_peaks":
+                result = [_number_peaks(x, 10)]
+
+            for layer in result:
+                layer = np.asarray(layer, dtype=np.float32)
+                # Set original all-NaN pixels back to NaN.
+                layer[all_nan] = np.nan
+                outputs.append(layer)
+
+    return tuple(outputs) if len(outputs) > 1 else outputs[0]
+
+
+def _temporal_statistics_numpy(da, stats):
+    """
+    Block-parallel engine used by `temporal_statistics` when
+    `engine="numpy"`. See that function for details.
+    """
+    for stat in stats:
+        if stat not in _TEMPORAL_STATS:
+            raise ValueError(f"{stat} is not one of the supported statistics {_TEMPORAL_STATS}")
+
+    # Dask arrays are processed block by block, which requires
+    # each block to contain the full time series
+    if dask.is_dask_collection(da):
+        da = da.chunk({"time": -1})
+
+    # The spatial mean time series used for discordance is computed
+    # over the full array so results do not depend on chunking
+    filled = da.where(~da.isnull().all("time"), other=0)
+    mean_ts = filled.mean(("y", "x"), skipna=False)
+
+    names = []
+    for stat in stats:
+        if stat in _FOURIER_STATS:
+            names.extend([stat + "_n1", stat + "_n2", stat + "_n3"])
+        else:
+            names.append(stat)
+
+    results = xr.apply_ufunc(
+        _temporal_stats_kernel,
+        da,
+        mean_ts,
+        kwargs={"stats": stats},
+        input_core_dims=[["time"], ["time"]],
+        output_core_dims=[[] for _ in names],
+        dask="parallelized",
+        output_dtypes=[np.float32 for _ in names],
+    )
+    if len(names) == 1:
+        results = (results,)
+
+    ds = xr.Dataset({name: result for name, result in zip(names, results)})
+    ds = ds.transpose("y", "x", ...)
+    for var in ds.data_vars:
+        ds[var].attrs = da.attrs
+
+    # try to add back the geobox
     try:
+        crs = da.geobox.crs
         ds = assign_crs(ds, str(crs))
     except:
         pass
 
-    return ds.drop("time")
+    return ds
 
 
-def temporal_statistics(da, stats):
+def temporal_statistics(da, stats, engine="hdstats"):
     """
     Calculate various generic summary statistics on any timeseries.
 
-    This function uses the hdstats temporal library:
+    By default this function uses the hdstats temporal library:
     https://github.com/daleroberts/hdstats/blob/master/hdstats/ts.pyx
 
-    last modified June 2023
+    Alternatively, `engine="numpy"` computes all requested statistics
+    together in one vectorised pass over each chunk of the data,
+    without requiring hdstats. Dask-backed arrays are returned as a
+    lazy Dataset.
+
+    last modified October 2026
 
     Parameters
     ----------
@@ -443,7 +479,16 @@ def temporal_statistics(da, stats):
         * 'complexity' =
         * 'central_diff' =
         * 'num_peaks' : The number of peaks in the timeseries, defined with a local
-            window of size 10.  NOTE: This statistic is very slow
+            window of size 10.  NOTE: This statistic is very slow with the
+            'hdstats' engine. The 'numpy' engine instead counts values which are
+            the maximum of the 10 values either side, which is much faster but
+            does not exactly match the hdstats wavelet-based peak detection.
+
+    engine : str
+        Either 'hdstats' (default) to use the hdstats library, or 'numpy'
+        to use vectorised implementations of the same statistics that are
+        computed lazily, chunk by chunk, for dask arrays. With the 'numpy'
+        engine all outputs are float32.
 
     Returns
     -------
@@ -453,6 +498,14 @@ def temporal_statistics(da, stats):
 
     """
 
+    # If stats supplied is not a list, convert to list.
+    stats = stats if isinstance(stats, list) else [stats]
+
+    if engine == "numpy":
+        return _temporal_statistics_numpy(da, stats)
+    elif engine != "hdstats":
+        raise ValueError("engine should be either 'hdstats' or 'numpy'")
+
     # if dask arrays then map the blocks
     if dask.is_dask_collection(da):
         if version.parse(xr.__version__) < version.parse("0.16.0"):
@@ -6,6 +6,8 @@ import calendar
 import warnings
 from datetime import datetime
 
+import dask
+import dask.array
 import datacube
 import geopandas as gpd
 import matplotlib.animation as animation
@@ -17,6 +19,7 @@ import seaborn as sns
 import xarray as xr
 from datacube.utils import geometry, masking
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes
+from shapely.geometry import box
 from skimage import exposure
 
 from deafrica_tools.bandindices import calculate_indices
@@ -98,6 +101,94 @@ def WIT_drill(
     # Create a datacube instance
     dc = datacube.Datacube(app="wetlands insight tool")
 
+    # load data and classify each pixel within the polygon
+    mask, tcw, wofls_wet, FC_dominant = _WIT_layers(
+        dc,
+        gdf.iloc[[0]],
+        query,
+        min_gooddata=min_gooddata,
+        TCW_threshold=TCW_threshold,
+        resample_frequency=resample_frequency,
+        dask_chunks=dask_chunks,
+        verbose=verbose,
+        verbose_progress=verbose_progress,
+    )
+
+    # pixel counts
+    pixels = mask.sum(dim=["x", "y"])
+
+    if verbose_progress:
+        print("Computing wetness")
+    tcw_pixel_count = tcw.sum(dim=["x", "y"]).compute()
+
+    if verbose_progress:
+        print("Computing green veg, dry veg, and bare soil")
+    FC_count = FC_dominant.sum(dim=["x", "y"]).compute()
+
+    if verbose_progress:
+        print("Computing open water")
+    wofs_pixels = wofls_wet.sum(dim=["x", "y"]).compute()
+
+    percents = _WIT_percentages(pixels, tcw_pixel_count, FC_count, wofs_pixels)
+
+    # start setup of dataframe by adding only one dataset
+    df = pd.DataFrame(
+        data=percents["wofs_area_percent"].data,
+        index=percents["wofs_area_percent"].time.values,
+        columns=["wofs_area_percent"],
+    )
+
+    # add data into pandas dataframe for export
+    for col in ["wet_percent", "green_veg_percent", "dry_veg_percent", "bare_soil_percent"]:
+        df[col] = percents[col].data
+
+    # round numbers
+    df = df.round(2)
+
+    # save the csv of the output data used to create the stacked plot for the polygon drill
+    if export_csv:
+        if verbose:
+            print("exporting csv: " + export_csv)
+        df.to_csv(export_csv, index_label="Datetime")
+
+    return df
+
+
+def _WIT_layers(
+    dc,
+    gdf,
+    query,
+    min_gooddata=0.85,
+    TCW_threshold=-0.035,
+    resample_frequency=None,
+    dask_chunks=None,
+    verbose=False,
+    verbose_progress=False,
+    attribute_col=None,
+    persist=True,
+):
+    """
+    Load Landsat, WOfS and FC data for a query and classify each pixel
+    within the polygons in `gdf` as used by the Wetlands Insight Tool.
+    Parameters are inherited from `WIT_drill`.
+
+    If `attribute_col` is given, polygons are rasterized using the
+    (positive integer) values of that column, otherwise into a
+    boolean mask. If `persist` is True, the wetness layer is persisted
+    in (distributed) memory.
+
+    Returns
+    -------
+    zones : xarray.DataArray
+        The rasterized polygons.
+    tcw : xarray.DataArray
+        Whether each pixel is wet according to tasseled cap wetness.
+    wofls_wet : xarray.DataArray
+        Whether each pixel is open water according to WOfS.
+    FC_dominant : xarray.Dataset
+        Whether each pixel is dominated by bare soil ('bs'), green
+        vegetation ('pv') or non-green vegetation ('npv').
+    """
     # load landsat 5,7,8 data
     warnings.filterwarnings("ignore")
 
@@ -118,7 +209,8 @@ def WIT_drill(
     )
 
     # create polygon mask
-    mask = xr_rasterize(gdf.iloc[[0]], ds_ls)
+    zones = xr_rasterize(gdf, ds_ls, attribute_col=attribute_col)
+    mask = zones > 0
     ds_ls = ds_ls.where(mask)
 
     # calculate tasselled cap wetness within masked AOI
@@ -137,7 +229,8 @@ def WIT_drill(
 
     tcw = tcw.TCW >= TCW_threshold
     tcw = tcw.where(mask, 0)
-    tcw = tcw.persist()
+    if persist:
+        tcw = tcw.persist()
 
     if verbose:
         print("Loading WOfS layers ")
@@ -171,7 +264,7 @@ def WIT_drill(
     # load fractional cover
     fc_ds = dc.load(
         product="fc_ls",
-        time=time,
+        time=query["time"],
         dask_chunks=dask_chunks,
         like=ds_ls,
         measurements=["pv", "npv", "bs"],
@@ -225,21 +318,21 @@ def WIT_drill(
         }
     )
 
-    # pixel counts
-    pixels = mask.sum(dim=["x", "y"])
+    return zones, tcw, wofls_wet, FC_dominant
 
-    if verbose_progress:
-        print("Computing wetness")
-    tcw_pixel_count = tcw.sum(dim=["x", "y"]).compute()
-
-    if verbose_progress:
-        print("Computing green veg, dry veg, and bare soil")
-    FC_count = FC_dominant.sum(dim=["x", "y"]).compute()
 
-    if verbose_progress:
-        print("Computing open water")
-    wofs_pixels = wofls_wet.sum(dim=["x", "y"]).compute()
+def _WIT_percentages(pixels, tcw_pixel_count, FC_count, wofs_pixels):
+    """
+    Convert pixel counts of each Wetlands Insight Tool class into the
+    percentage of each polygon covered by each class, handling any
+    no-data pixels within the polygon.
 
+    Returns
+    -------
+    dict
+        Percentages for 'wofs_area_percent', 'wet_percent',
+        'green_veg_percent', 'dry_veg_percent' and 'bare_soil_percent'.
+    """
     # count percentages
     wofs_area_percent = (wofs_pixels / pixels) * 100
     tcw_area_percent = (tcw_pixel_count / pixels) * 100
@@ -267,27 +360,223 @@ def WIT_drill(
     # greater than the wetness extent, thus make negative values == zero
     tcw_less_wofs = tcw_less_wofs.where(tcw_less_wofs >= 0, 0)
 
-    # start setup of dataframe by adding only one dataset
-    df = pd.DataFrame(
-        data=wofs_area_percent.data,
-        index=wofs_area_percent.time.values,
-        columns=["wofs_area_percent"],
+    return {
+        "wofs_area_percent": wofs_area_percent,
+        "wet_percent": tcw_less_wofs,
+        "green_veg_percent": PV_percent,
+        "dry_veg_percent": NPV_percent,
+        "bare_soil_percent": BS_percent,
+    }
+
+
+def _zonal_pixel_sums(arr, zones, n_zones):
+    """
+    Lazily sum the values of a (time, y, x) array within each zone of
+    a rasterized array of zone ids (1 to `n_zones`, with 0 outside all
+    zones), treating NaNs as 0. Sums are computed per dask block with
+    `np.bincount` and then combined.
+
+    Returns
+    -------
+    dask.array.Array
+        An array of sums with shape (time, n_zones).
+    """
+    data = arr.transpose("time", "y", "x").data
+    if not isinstance(data, dask.array.Array):
+        data = dask.array.from_array(data, chunks=(-1, -1, -1))
+
+    # match the zones to the spatial chunks of the data
+    zone_ids = dask.array.from_array(zones.values, chunks=data.chunks[1:])[None]
+
+    def _block_sums(values, ids):
+        n_time = values.shape[0]
+        values = np.nan_to_num(values.astype(np.float64)).reshape(n_time, -1)
+        ids = np.broadcast_to(ids.reshape(1, -1), values.shape)
+        flat = (np.arange(n_time)[:, None] * (n_zones + 1) + ids).ravel()
+        sums = np.bincount(flat, weights=values.ravel(), minlength=n_time * (n_zones + 1))
+        return sums.reshape(n_time, 1, 1, n_zones + 1)[..., 1:]
+
+    sums = dask.array.map_blocks(
+        _block_sums,
+        data,
+        zone_ids,
+        new_axis=3,
+        chunks=(
+            data.chunks[0],
+            (1,) * len(data.chunks[1]),
+            (1,) * len(data.chunks[2]),
+            (n_zones,),
+        ),
+        dtype=np.float64,
     )
+    return sums.sum(axis=(1, 2))
 
-    # add data into pandas dataframe for export
-    df["wet_percent"] = tcw_less_wofs.data
-    df["green_veg_percent"] = PV_percent.data
-    df["dry_veg_percent"] = NPV_percent.data
-    df["bare_soil_percent"] = BS_percent.data
+
+def WIT_drill_batch(
+    gdf,
+    time,
+    id_col=None,
+    min_gooddata=0.85,
+    TCW_threshold=-0.035,
+    resample_frequency=None,
+    export_csv=None,
+    dask_chunks=None,
+    group_size=50000,
+    verbose=False,
+):
+    """
+    The Wetlands Insight Tool run over many polygons at once.
+
+    Neighbouring polygons are grouped into tiles, and the FC, WOfS
+    and Landsat data for each tile are loaded only once. Pixel counts
+    for every class and polygon are calculated lazily using grouped
+    sums over a raster of polygon ids, and all tiles are then computed
+    together in a single `dask.compute` call.
+
+    The output is a long-format pandas dataframe containing a timeseries
+    of the relative fractions of each class for every polygon.
+
+    Note that `min_gooddata` is evaluated over the extent of each tile
+    rather than each polygon. Where polygons overlap, shared pixels are
+    only counted for one of them.
+
+    Last modified: Oct 2026
+
+    Parameters
+    ----------
+    gdf : geopandas.GeoDataFrame
+        The polygons you wish to interrograte.
+    time : tuple
+        a tuple containing the time range over which to run the WIT.
+        e.g. ('2015-01' , '2019-12')
+    id_col : str, optional
+        The column of `gdf` used to identify each polygon in the output.
+        Defaults to None, which uses the index of `gdf`.
+    min_gooddata : Float, optional
+        A number between 0 and 1 (e.g 0.8) indicating the minimum percentage
+        of good quality pixels required for a satellite observation to be loaded.
+        See `WIT_drill`.
+    TCW_threshold : Int, optional
+        The tasseled cap wetness threshold, beyond which a pixel will be
+        considered 'wet'. Defaults to -0.035.
+    resample_frequency : str
+        Option for resampling time-series of input datasets. See `WIT_drill`.
+    export_csv : str, optional
+        To save the returned pandas dataframe as a .csv file, pass a
+        a location string (e.g. 'output/results.csv')
+    dask_chunks : dict, optional
+        The dimensions over which to chunk the lazily loaded datasets.
+        Defaults to {'time': 1, 'x': 1000, 'y': 1000}.
+    group_size : float, optional
+        The size in metres of the grid (in EPSG:6933) used to group
+        neighbouring polygons into tiles. Polygons are grouped by the
+        grid cell containing their centroid. Defaults to 50000.
+    verbose: bool, optional
+        If true, print statements are putput detailing the progress of the tool.
+
+    Returns
+    -------
+    df : Pandas.Dataframe
+        A long-format pandas dataframe with one row per polygon and time,
+        containing the relative fractions of each land cover class
+        (WOfs, FC, TCW)
+
+    """
+    if dask_chunks is None:
+        dask_chunks = {"time": 1, "x": 1000, "y": 1000}
+
+    ids = gdf.index if id_col is None else gdf[id_col]
+    id_name = "id" if id_col is None else id_col
+    gdf = gdf.reset_index(drop=True).to_crs("epsg:6933")
+
+    # group neighbouring polygons by the grid cell of their centroid
+    centroids = gdf.geometry.centroid
+    cells = pd.DataFrame(
+        {
+            "x": np.floor(centroids.x.values / group_size),
+            "y": np.floor(centroids.y.values / group_size),
+        }
+    )
+    groups = list(cells.groupby(["x", "y"]).indices.values())
+
+    # Create a datacube instance
+    dc = datacube.Datacube(app="wetlands insight tool")
+
+    lazy_counts = []
+    for i, positions in enumerate(groups):
+        if verbose:
+            print(f"Setting up tile {i + 1}/{len(groups)}")
+
+        gdf_group = gdf.iloc[positions].copy()
+        gdf_group["zone"] = np.arange(1, len(positions) + 1)
+        geom = geometry.Geometry(geom=box(*gdf_group.total_bounds), crs=gdf_group.crs)
+        query = {"geopolygon": geom, "time": time}
+
+        zones, tcw, wofls_wet, FC_dominant = _WIT_layers(
+            dc,
+            gdf_group,
+            query,
+            min_gooddata=min_gooddata,
+            TCW_threshold=TCW_threshold,
+            resample_frequency=resample_frequency,
+            dask_chunks=dask_chunks,
+            verbose=verbose,
+            attribute_col="zone",
+            persist=False,
+        )
+
+        # lazy per-polygon pixel counts for each class, with the
+        # times of each layer (which may differ after resampling)
+        n_zones = len(positions)
+        layers = {
+            "tcw": tcw,
+            "bs": FC_dominant.bs,
+            "pv": FC_dominant.pv,
+            "npv": FC_dominant.npv,
+            "wofs": wofls_wet,
+        }
+        count = {
+            name: (layer.time.values, _zonal_pixel_sums(layer, zones, n_zones))
+            for name, layer in layers.items()
+        }
+        count["pixels"] = np.bincount(zones.values.ravel(), minlength=n_zones + 1)[1:]
+        lazy_counts.append(count)
+
+    # compute the pixel counts for all tiles at once
+    if verbose:
+        print("Computing pixel counts for all polygons")
+    (counts,) = dask.compute(lazy_counts)
+
+    dfs = []
+    for positions, count in zip(groups, counts):
+
+        def _to_xr(layer):
+            times, values = count[layer]
+            return xr.DataArray(
+                values,
+                coords={"time": times, id_name: ids.values[positions]},
+                dims=["time", id_name],
+            )
+
+        FC_count = xr.Dataset({stat: _to_xr(stat) for stat in ["bs", "pv", "npv"]})
+        percents = _WIT_percentages(
+            xr.DataArray(count["pixels"], coords={id_name: ids.values[positions]}, dims=[id_name]),
+            _to_xr("tcw"),
+            FC_count,
+            _to_xr("wofs"),
+        )
+        dfs.append(xr.Dataset(percents).to_dataframe().reset_index())
+
+    df = pd.concat(dfs, ignore_index=True)
+    df = df[[id_name, "time", *percents.keys()]]
 
     # round numbers
     df = df.round(2)
 
-    # save the csv of the output data used to create the stacked plot for the polygon drill
     if export_csv:
         if verbose:
             print("exporting csv: " + export_csv)
-        df.to_csv(export_csv, index_label="Datetime")
+        df.to_csv(export_csv, index=False)
 
     return df
 